@@ -0,0 +1,104 @@
+# benchmarks/bench_html_parsers.py - Compare HTML parser backends on marketplace pages
+#
+#   python benchmarks/bench_html_parsers.py [PAGES_DIR] [--repeat N]
+#
+# PAGES_DIR holds saved search-result pages named <marketplace>*.html (e.g.
+# jumia_laptop.html) so the marketplace's product selector can be used for
+# scoped parsing. Without it a synthetic Jumia-like page is generated.
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.scrapers.html_parsing import make_soup, strainer_for
+
+# Product container selectors, as in MarketplaceScraper.marketplaces
+PRODUCT_SELECTORS = {
+    'amazon': '[data-component-type="s-search-result"]',
+    'walmart': '[data-item-id]',
+    'jumia': '.prd',
+    'kilimall': '.list-good-item',
+    'konga': '.product-card',
+    'masoko': '.product-item',
+    'ebay': '.s-item',
+    'aliExpress': '.product-container',
+    'target': '[data-test="product-details"]',
+    'takealot': '.product-anchor',
+    'copia': '.product-item',
+}
+
+
+def synthetic_page(products=200):
+    """Jumia-like search page: product cards buried in navigation, scripts and footer"""
+    noise = ''.join(f'<li><a href="/c/{i}">Category {i}</a></li>' for i in range(400))
+    script = '<script>var state = {' + ','.join(f'"k{i}": {i}' for i in range(3000)) + '};</script>'
+    cards = ''.join(
+        f'<article class="prd _fb col c-prd"><a class="core" href="/p/{i}">'
+        f'<div class="img-c"><img src="/img/{i}.jpg"></div>'
+        f'<div class="info"><h3 class="name">Product {i} laptop 8GB RAM</h3>'
+        f'<div class="prc">KSh {1000 + i}</div><div class="rev">4.{i % 10} out of 5'
+        f'<div class="stars _s">({i})</div></div></div></a></article>'
+        for i in range(products)
+    )
+    return (f'<html><head>{script}</head><body><nav><ul>{noise}</ul></nav>'
+            f'<main><section class="card">{cards}</section></main>'
+            f'<footer><ul>{noise}</ul></footer></body></html>').encode('utf-8')
+
+
+def load_pages(pages_dir):
+    if not pages_dir:
+        return [('synthetic_jumia', synthetic_page(), PRODUCT_SELECTORS['jumia'])]
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+        name = os.path.basename(path)
+        selector = next((sel for mp, sel in PRODUCT_SELECTORS.items()
+                         if name.lower().startswith(mp.lower())), None)
+        with open(path, 'rb') as f:
+            pages.append((name, f.read(), selector))
+    return pages
+
+
+def measure(markup, backend, selector, scoped, repeat):
+    strainer = strainer_for(selector) if scoped and selector else None
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = make_soup(markup, parse_only=strainer, backend=backend)
+        found = len(soup.select(selector)) if selector else 0
+        soup.decompose()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    soup = make_soup(markup, parse_only=strainer, backend=backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    soup.decompose()
+    return statistics.median(timings), peak, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare HTML parser backends')
+    parser.add_argument('pages_dir', nargs='?')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'page':<28}{'backend':<13}{'mode':<8}{'median ms':>10}{'peak MB':>9}{'items':>7}")
+    for name, markup, selector in load_pages(args.pages_dir):
+        for backend in ('html.parser', 'lxml'):
+            for scoped in (False, True):
+                if scoped and not (selector and strainer_for(selector)):
+                    continue
+                seconds, peak, found = measure(markup, backend, selector, scoped, args.repeat)
+                mode = 'scoped' if scoped else 'full'
+                print(f"{name[:27]:<28}{backend:<13}{mode:<8}{seconds * 1000:>10.1f}"
+                      f"{peak / 1024 / 1024:>9.1f}{found:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/bench_ingest.py - ScrapedData rows/sec, per-item vs bulk ingestion
+#
+#   python benchmarks/bench_ingest.py [--items N] [--niches N] [--repeat N]
+#
+# Runs against a throwaway SQLite file (not db.sqlite3) migrated on start.
+# NLP results are faked so only persistence is measured: the per-item path
+# is the old get_or_create + create + save per item, the bulk path is the
+# map-resolved sources + one bulk_create transaction per niche.
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'trendy_project.settings')
+
+import django
+from django.conf import settings
+
+SOURCES = ['news', 'news_direct', 'reddit', 'google_trends', 'amazon', 'twitter']
+
+
+def make_items(n, run):
+    # Distinct headlines, so near-duplicate collapsing does not shrink the batch
+    return [
+        {
+            'source': SOURCES[i % len(SOURCES)],
+            'title': f"Run {run} story {i}: county {i % 47} reports item {i * 7919} in sector {i % 13}",
+            'url': f"https://example.com/{run}/{i}",
+            '_fetched': i,
+        }
+        for i in range(n)
+    ]
+
+
+def fake_nlp(record):
+    record.keywords = record.raw_data['title'].split()[:5]
+    record.sentiment = 0.6
+
+
+def per_item(niche, items):
+    from core.models import DataSource, ScrapedData
+    from core.services.dedupe import NearDuplicateIndex
+    from core.tasks import DEDUPE_SOURCE_PREFIX, clean_data, extract_text_from_data
+
+    index = NearDuplicateIndex.load(niche)
+    for data_item in items:
+        text = extract_text_from_data(data_item)
+        dedupe = bool(text) and data_item.get('source', '').startswith(DEDUPE_SOURCE_PREFIX)
+        if dedupe and index.duplicate_of(text) is not None:
+            continue
+        record = ScrapedData.objects.create(
+            niche=niche,
+            source=DataSource.objects.get_or_create(
+                name=data_item.get('source', 'unknown'), defaults={'is_active': True}
+            )[0],
+            raw_data=data_item,
+            cleaned_data=clean_data(data_item),
+        )
+        if dedupe:
+            index.add(text, record)
+        fake_nlp(record)
+        record.save()
+    index.save()
+
+
+def bulk(niche, items, sources):
+    from core.services.dedupe import NearDuplicateIndex
+    from core.tasks import build_scraped_records, save_scraped_records
+
+    index = NearDuplicateIndex.load(niche)
+    records, repeats, _ = build_scraped_records(niche, items, sources, index)
+    for record in records:
+        fake_nlp(record)
+    save_scraped_records(records, index, repeats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ScrapedData ingestion throughput')
+    parser.add_argument('--items', type=int, default=500, help='items per niche')
+    parser.add_argument('--niches', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    db = tempfile.NamedTemporaryFile(suffix='.sqlite3', delete=False)
+    db.close()
+    settings.DATABASES['default']['NAME'] = db.name
+    django.setup()
+
+    from django.core.management import call_command
+    from core.models import Niche
+    from core.tasks import load_data_sources
+
+    try:
+        call_command('migrate', verbosity=0)
+        niches = [Niche.objects.create(name=f"niche {i}") for i in range(args.niches)]
+        rows = args.items * args.niches
+
+        print(f"{rows} rows per run ({args.niches} niches x {args.items} items), sqlite: {db.name}")
+        print(f"{'path':<10}{'median s':>10}{'rows/s':>12}")
+        run = 0
+        for name in ('per-item', 'bulk'):
+            timings = []
+            for _ in range(args.repeat):
+                run += 1
+                batches = [make_items(args.items, f"{run}-{n.pk}") for n in niches]
+                start = time.perf_counter()
+                sources = load_data_sources()
+                for niche, items in zip(niches, batches):
+                    if name == 'bulk':
+                        bulk(niche, items, sources)
+                    else:
+                        per_item(niche, items)
+                timings.append(time.perf_counter() - start)
+            seconds = statistics.median(timings)
+            print(f"{name:<10}{seconds:>10.3f}{rows / seconds:>12.0f}")
+    finally:
+        os.unlink(db.name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_sentiment.py - Throughput of the sentiment backends
+#
+#   python benchmarks/bench_sentiment.py [TEXTS_FILE] [--copies N] [--repeat N]
+#
+# TEXTS_FILE holds one text per line (e.g. exported headlines). Without it a
+# small built-in headline set is used. The corpus is repeated --copies times.
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from textblob import TextBlob
+
+from core.services.sentiment_engine import LexiconScorer
+
+HEADLINES = [
+    "Safaricom's M-Pesa hits record: 'best quarter ever' -- CEO",
+    "Nairobi traffic (again) worse than last year...",
+    "Why Kenya's startups aren't failing: a surprisingly good 2024",
+    "Fuel prices rise 5.6% in Q3; consumers unhappy!!",
+    "Mr. Ruto says the U.S. deal is 'not bad at all'",
+    "Top 10 affordable smartphones under KSh 20,000",
+    "Heavy rains cause deadly floods in Mombasa",
+    "Experts: AI won't replace teachers anytime soon",
+    '"Incredible" comeback for Harambee Stars',
+    "Is this the end of cheap loans? Banks hike rates",
+]
+
+
+def textblob_scores(texts):
+    return [(TextBlob(text).sentiment.polarity + 1) / 2 for text in texts]
+
+
+def measure(score, texts, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = score(texts)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sentiment backend throughput')
+    parser.add_argument('texts_file', nargs='?')
+    parser.add_argument('--copies', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.texts_file:
+        with open(args.texts_file, encoding='utf-8') as f:
+            corpus = [line.strip() for line in f if line.strip()]
+    else:
+        corpus = HEADLINES
+    texts = corpus * args.copies
+
+    start = time.perf_counter()
+    scorer = LexiconScorer()
+    print(f"lexicon load: {(time.perf_counter() - start) * 1000:.1f} ms, {len(texts)} texts")
+
+    baseline, expected = measure(textblob_scores, texts, args.repeat)
+    print(f"{'backend':<10}{'median s':>10}{'texts/s':>12}{'max diff':>10}")
+    print(f"{'textblob':<10}{baseline:>10.3f}{len(texts) / baseline:>12.0f}{0:>10.4f}")
+
+    seconds, results = measure(scorer.score_batch, texts, args.repeat)
+    diff = max((abs(a - b) for a, b in zip(results, expected)), default=0.0)
+    print(f"{'lexicon':<10}{seconds:>10.3f}{len(texts) / seconds:>12.0f}{diff:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
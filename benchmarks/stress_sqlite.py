@@ -0,0 +1,126 @@
+# benchmarks/stress_sqlite.py - Concurrent writers and readers on a SQLite file
+#
+#   python benchmarks/stress_sqlite.py [--writers N] [--readers N] [--writes N] [--rows N]
+#
+# Each profile runs in its own process against a throwaway database file:
+#   plain    Django's defaults: rollback journal, deferred transactions
+#   wal      SQLITE_PRAGMAS and IMMEDIATE transactions, every thread commits itself
+#   batched  as wal, with writes funnelled through core.db's WriteBatcher
+# Writers insert ScrapedData rows in small transactions (like scrape tasks
+# storing a niche), readers run dashboard-style queries until they finish.
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'trendy_project.settings')
+
+import django
+from django.conf import settings
+
+PROFILES = ('plain', 'wal', 'batched')
+
+
+def configure(profile, path):
+    database = settings.DATABASES['default']
+    database['NAME'] = path
+    if profile == 'plain':
+        database['OPTIONS'] = {}
+        settings.SQLITE_PRAGMAS = {}
+    settings.WRITE_BATCHING = profile == 'batched'
+    django.setup()
+
+
+def run(profile, args):
+    from django.core.management import call_command
+    from django.db import OperationalError, connection
+    from core.db import write
+    from core.models import DataSource, Niche, ScrapedData
+
+    call_command('migrate', verbosity=0)
+    niche = Niche.objects.create(name='stress')
+    source = DataSource.objects.create(name='news')
+    connection.close()
+
+    done = threading.Event()
+    counts = {'rows': 0, 'reads': 0, 'write_errors': 0, 'read_errors': 0}
+    lock = threading.Lock()
+
+    def insert(writer, n):
+        ScrapedData.objects.bulk_create([
+            ScrapedData(niche=niche, source=source, raw_data={'title': f"writer {writer} item {n}.{i}"})
+            for i in range(args.rows)
+        ])
+
+    def writer(w):
+        try:
+            for n in range(args.writes):
+                try:
+                    write(insert, w, n)
+                    with lock:
+                        counts['rows'] += args.rows
+                except OperationalError:
+                    with lock:
+                        counts['write_errors'] += 1
+        finally:
+            connection.close()
+
+    def reader():
+        try:
+            while not done.is_set():
+                try:
+                    list(ScrapedData.objects.filter(niche=niche).order_by('-created_at')[:50])
+                    ScrapedData.objects.filter(niche=niche).count()
+                    with lock:
+                        counts['reads'] += 1
+                except OperationalError:
+                    with lock:
+                        counts['read_errors'] += 1
+        finally:
+            connection.close()
+
+    readers = [threading.Thread(target=reader) for _ in range(args.readers)]
+    writers = [threading.Thread(target=writer, args=(w,)) for w in range(args.writers)]
+    start = time.perf_counter()
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    seconds = time.perf_counter() - start
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    print(f"{profile:<9}{seconds:>9.2f}{counts['rows'] / seconds:>10.0f}{counts['reads'] / seconds:>10.0f}"
+          f"{counts['write_errors']:>11}{counts['read_errors']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stress SQLite with concurrent writers and readers')
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writes', type=int, default=50, help='transactions per writer')
+    parser.add_argument('--rows', type=int, default=20, help='rows per transaction')
+    parser.add_argument('--dir', help='where to create the database files (default: system temp dir)')
+    parser.add_argument('--profile', choices=PROFILES)
+    args = parser.parse_args()
+
+    if args.profile:
+        with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+            configure(args.profile, os.path.join(directory, 'stress.sqlite3'))
+            run(args.profile, args)
+        return
+
+    print(f"{args.writers} writers x {args.writes} transactions x {args.rows} rows, {args.readers} readers")
+    print(f"{'profile':<9}{'seconds':>9}{'rows/s':>10}{'reads/s':>10}{'w errors':>11}{'r errors':>11}")
+    for profile in PROFILES:
+        # A fresh process per profile: connection settings are read at setup
+        subprocess.run([sys.executable, __file__, '--profile', profile, *sys.argv[1:]], check=True)
+
+
+if __name__ == '__main__':
+    main()
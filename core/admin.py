@@ -1,6 +1,6 @@
 # core/admin.py
 from django.contrib import admin
-from .models import Niche, DataSource, ScrapedData, Trend, AdKeyword
+from .models import Niche, DataSource, ScrapedData, Trend, AdKeyword, FeedCache, FeedHealth, NLPCacheEntry, HeadlineFingerprint, DuplicateCopy, NicheTermStats
 
 @admin.register(Niche)
 class NicheAdmin(admin.ModelAdmin):
@@ -14,14 +14,14 @@ class DataSourceAdmin(admin.ModelAdmin):
 
 @admin.register(ScrapedData)
 class ScrapedDataAdmin(admin.ModelAdmin):
-    list_display = ['niche', 'source', 'sentiment', 'created_at']
+    list_display = ['niche', 'source', 'sentiment', 'duplicate_count', 'created_at']
     list_filter = ['source', 'niche', 'created_at']
-    readonly_fields = ['created_at']
+    readonly_fields = ['fingerprint', 'created_at']
 
 @admin.register(Trend)
 class TrendAdmin(admin.ModelAdmin):
-    list_display = ['niche', 'keywords_preview', 'sentiment', 'score', 'source', 'created_at']
-    list_filter = ['niche', 'source', 'created_at']
+    list_display = ['niche', 'keywords_preview', 'sentiment', 'score', 'item_count', 'is_open', 'source', 'updated_at']
+    list_filter = ['niche', 'source', 'is_open', 'created_at']
     
     def keywords_preview(self, obj):
         return ', '.join(obj.keywords[:3]) if obj.keywords else 'None'
@@ -31,4 +31,35 @@ class TrendAdmin(admin.ModelAdmin):
 class AdKeywordAdmin(admin.ModelAdmin):
     list_display = ['keyword', 'trend', 'performance_score', 'source']
     list_filter = ['source', 'trend__niche']
-    search_fields = ['keyword']
\ No newline at end of file
+    search_fields = ['keyword']
+
+@admin.register(FeedCache)
+class FeedCacheAdmin(admin.ModelAdmin):
+    list_display = ['url', 'etag', 'modified', 'fetched_at', 'checked_at']
+    search_fields = ['url']
+    readonly_fields = ['checked_at']
+
+@admin.register(FeedHealth)
+class FeedHealthAdmin(admin.ModelAdmin):
+    list_display = ['url', 'fetch_count', 'error_count', 'error_rate', 'avg_latency', 'last_changed_at', 'change_interval']
+    search_fields = ['url']
+
+@admin.register(NLPCacheEntry)
+class NLPCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'version', 'text_hash', 'created_at']
+    list_filter = ['kind', 'version']
+
+@admin.register(HeadlineFingerprint)
+class HeadlineFingerprintAdmin(admin.ModelAdmin):
+    list_display = ['scraped_data', 'niche', 'created_at']
+    list_filter = ['niche']
+
+@admin.register(DuplicateCopy)
+class DuplicateCopyAdmin(admin.ModelAdmin):
+    list_display = ['fingerprint', 'canonical', 'niche', 'created_at']
+    list_filter = ['niche']
+
+@admin.register(NicheTermStats)
+class NicheTermStatsAdmin(admin.ModelAdmin):
+    list_display = ['niche', 'n_docs', 'n_features', 'updated_at']
+    exclude = ['doc_freq']
\ No newline at end of file
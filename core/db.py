@@ -0,0 +1,146 @@
+# core/db.py
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import connection, transaction
+
+# journal_mode is stored in the database file itself, unlike the other
+# pragmas. Management commands that only inspect the project (or use their
+# own test database) leave it alone, so they don't rewrite db.sqlite3.
+PERSISTENT_PRAGMAS = {'journal_mode'}
+INSPECT_COMMANDS = {'check', 'diffsettings', 'help', 'inspectdb', 'makemigrations', 'showmigrations',
+                    'sqlmigrate', 'test'}
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """connection_created handler: apply SQLITE_PRAGMAS to each new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    skip = PERSISTENT_PRAGMAS if inspect_only(sys.argv) else set()
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            if name not in skip:
+                cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def inspect_only(argv):
+    """Whether the process is a manage.py / django-admin command in INSPECT_COMMANDS"""
+    return (
+        len(argv) > 1
+        and os.path.basename(argv[0]) in ('manage.py', 'django-admin', '__main__.py')
+        and argv[1] in INSPECT_COMMANDS
+    )
+
+
+class WriteBatcher:
+    """
+    A single writer thread that runs write jobs from many threads in shared
+    transactions.
+
+    SQLite allows one writer at a time and every commit is a sync, so
+    threads writing on their own contend for the lock and pay a commit each.
+    Here jobs queue up while the writer commits, and it then runs all that
+    has arrived (up to max_jobs, optionally waiting max_delay seconds for
+    more) in one transaction. Each job gets a savepoint, so a failing job is
+    rolled back and reported to its caller without affecting the others.
+    """
+
+    def __init__(self, max_jobs=50, max_delay=0.0):
+        self.max_jobs = max_jobs
+        self.max_delay = max_delay
+        self.transactions = 0
+        self.jobs = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='write-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) for the writer; returns a Future of its result"""
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def close(self):
+        """Finish the queued jobs and stop the writer"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    return
+                batch = [job]
+                deadline = time.monotonic() + self.max_delay
+                while len(batch) < self.max_jobs:
+                    try:
+                        job = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        self._write(batch)
+                        return
+                    batch.append(job)
+                self._write(batch)
+        finally:
+            connection.close()
+
+    def _write(self, batch):
+        outcomes = []
+        try:
+            with transaction.atomic():
+                for future, fn, args, kwargs in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with transaction.atomic():
+                            outcomes.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            # The commit itself failed: nothing in the batch was written
+            outcomes = [(future, None, e) for future, _, _ in outcomes]
+        self.transactions += 1
+        self.jobs += len(batch)
+        # Callers hear back only once their writes are committed
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+_batcher = None
+_batcher_pid = None
+_batcher_lock = threading.Lock()
+
+
+def get_write_batcher():
+    """The process's WriteBatcher, started on first call (and again in a forked child)"""
+    global _batcher, _batcher_pid
+    if _batcher is None or _batcher_pid != os.getpid():
+        with _batcher_lock:
+            if _batcher is None or _batcher_pid != os.getpid():
+                _batcher = WriteBatcher()
+                _batcher_pid = os.getpid()
+    return _batcher
+
+
+def write(fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) in a write transaction and return its result.
+
+    With WRITE_BATCHING on it runs on the process's writer thread, coalesced
+    with other threads' writes; otherwise (or if the caller is already in a
+    transaction, whose lock the writer thread would wait on) it runs here.
+    """
+    if getattr(settings, 'WRITE_BATCHING', False) and not connection.in_atomic_block:
+        return get_write_batcher().submit(fn, *args, **kwargs).result()
+    with transaction.atomic():
+        return fn(*args, **kwargs)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.services.retention import archive_expired, compact_cleaned_data, purge_nlp_cache
+
+
+class Command(BaseCommand):
+    help = "Archive and delete scraped items past their source's retention, compact the rest and age out the NLP cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only count the items that would be archived')
+        parser.add_argument('--no-compact', action='store_true', help="Don't drop derivable cleaned_data")
+        parser.add_argument('--vacuum', action='store_true', help='VACUUM the database afterwards to reclaim space')
+        parser.add_argument('--archive-dir', help='Archive location (default: ARCHIVE_DIR)')
+
+    def handle(self, *args, **options):
+        archived = archive_expired(root=options['archive_dir'], dry_run=options['dry_run'])
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        for source, count in sorted(archived.items()):
+            self.stdout.write(f"{verb} {count} {source} items")
+        if options['dry_run']:
+            return
+
+        if not options['no_compact']:
+            self.stdout.write(f"Compacted {compact_cleaned_data()} items")
+        self.stdout.write(f"Purged {sum(purge_nlp_cache().values())} NLP cache entries")
+        if options['vacuum'] and connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+            self.stdout.write('Vacuumed the database')
+        self.stdout.write(self.style.SUCCESS(f"Archived {sum(archived.values())} items"))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_datasource_data_type_remove_datasource_url_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, unique=True)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('modified', models.CharField(blank=True, max_length=64)),
+                ('entries', models.JSONField(default=list)),
+                ('fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('checked_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_feedcache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedHealth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, unique=True)),
+                ('fetch_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('avg_latency', models.FloatField(default=0.0)),
+                ('last_fetched_at', models.DateTimeField(blank=True, null=True)),
+                ('last_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('change_interval', models.FloatField(blank=True, null=True)),
+                ('niche_yields', models.JSONField(default=dict)),
+            ],
+        ),
+    ]
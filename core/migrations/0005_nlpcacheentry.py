@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_feedhealth'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NLPCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('version', models.CharField(max_length=100)),
+                ('text_hash', models.CharField(max_length=40)),
+                ('value', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'version', 'text_hash'), name='unique_nlp_cache_entry')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_nlpcacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapeddata',
+            name='duplicate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='HeadlineFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('niche', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.niche')),
+                ('scraped_data', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='core.scrapeddata')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['niche', 'created_at'], name='core_headli_niche_i_666667_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_headlinefingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NicheTermStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('n_features', models.PositiveIntegerField()),
+                ('n_docs', models.PositiveIntegerField(default=0)),
+                ('doc_freq', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('niche', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.niche')),
+            ],
+        ),
+    ]
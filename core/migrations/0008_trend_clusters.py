@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_nichetermstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trend',
+            name='is_open',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='trend',
+            name='item_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='trend',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='trend',
+            index=models.Index(fields=['niche', 'is_open', 'updated_at'], name='core_trend_niche_i_ec6ace_idx'),
+        ),
+    ]
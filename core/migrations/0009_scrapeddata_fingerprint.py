@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:43
+
+from django.db import migrations, models
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # Fingerprint stored rows like new ones, or the next run would store them
+    # all again. A row whose fingerprint an earlier row of the niche already
+    # has keeps NULL, so the unique constraint can be added.
+    from core.services.dedupe import content_fingerprint
+    from core.tasks import extract_text_from_data
+
+    ScrapedData = apps.get_model('core', 'ScrapedData')
+    seen = set()
+    batch = []
+    rows = ScrapedData.objects.select_related('source').order_by('pk')
+    for record in rows.iterator(chunk_size=1000):
+        data = record.raw_data if isinstance(record.raw_data, dict) else {}
+        fingerprint = content_fingerprint(
+            record.source.name, data.get('link') or data.get('url'), extract_text_from_data(data)
+        )
+        if fingerprint is None or (record.niche_id, fingerprint) in seen:
+            continue
+        seen.add((record.niche_id, fingerprint))
+        record.fingerprint = fingerprint
+        batch.append(record)
+        if len(batch) >= 500:
+            ScrapedData.objects.bulk_update(batch, ['fingerprint'])
+            batch = []
+    ScrapedData.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_trend_clusters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapeddata',
+            name='fingerprint',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='scrapeddata',
+            constraint=models.UniqueConstraint(fields=('niche', 'fingerprint'), name='unique_scraped_data_fingerprint'),
+        ),
+    ]
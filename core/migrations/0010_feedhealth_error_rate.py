@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:57
+
+from django.db import migrations, models
+
+
+def backfill_error_rate(apps, schema_editor):
+    # Start from the lifetime ratio the old error_rate property returned
+    FeedHealth = apps.get_model('core', 'FeedHealth')
+    for record in FeedHealth.objects.filter(fetch_count__gt=0):
+        record.error_rate = record.error_count / record.fetch_count
+        record.save(update_fields=['error_rate'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_scrapeddata_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedhealth',
+            name='error_rate',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(backfill_error_rate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 20:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_feedhealth_error_rate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateCopy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('canonical', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='copies', to='core.scrapeddata')),
+                ('niche', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.niche')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='core_duplic_created_5b34c9_idx')],
+                'constraints': [models.UniqueConstraint(fields=('niche', 'fingerprint'), name='unique_duplicate_copy')],
+            },
+        ),
+    ]
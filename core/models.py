@@ -36,6 +36,8 @@ class ScrapedData(models.Model):
     keywords = models.JSONField(default=list)
     sentiment = models.FloatField(default=0.0)
     engagement_score = models.FloatField(default=0.0)  # Likes, shares, etc.
+    duplicate_count = models.PositiveIntegerField(default=0)  # Near-duplicate copies collapsed into this item
+    fingerprint = models.CharField(max_length=40, null=True, blank=True)  # Content hash, see dedupe.content_fingerprint
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -43,6 +45,9 @@ class ScrapedData(models.Model):
             models.Index(fields=['niche', 'created_at']),
             models.Index(fields=['source', 'created_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(fields=['niche', 'fingerprint'], name='unique_scraped_data_fingerprint'),
+        ]
 
 class Trend(models.Model):
     niche = models.ForeignKey(Niche, on_delete=models.CASCADE)
@@ -50,10 +55,106 @@ class Trend(models.Model):
     sentiment = models.FloatField(default=0.0)
     score = models.FloatField(default=0.0)
     source = models.CharField(max_length=50, default='multiple')
+    item_count = models.PositiveIntegerField(default=1)  # Scraped items clustered into this trend
+    is_open = models.BooleanField(default=True)  # Still accepting new items
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['niche', 'is_open', 'updated_at']),
+        ]
 
 class AdKeyword(models.Model):
     trend = models.ForeignKey(Trend, on_delete=models.CASCADE)
     keyword = models.CharField(max_length=200)
     performance_score = models.FloatField(default=0.0)
-    source = models.CharField(max_length=50)
\ No newline at end of file
+    source = models.CharField(max_length=50)
+
+class FeedCache(models.Model):
+    """Conditional GET validators and last parsed entries for an RSS/Atom feed"""
+    url = models.URLField(max_length=500, unique=True)
+    etag = models.CharField(max_length=255, blank=True)
+    modified = models.CharField(max_length=64, blank=True)
+    entries = models.JSONField(default=list)
+    fetched_at = models.DateTimeField(null=True, blank=True)  # Last full download
+    checked_at = models.DateTimeField(auto_now=True)  # Last request, 304 or not
+    
+    def __str__(self):
+        return self.url
+
+
+class FeedHealth(models.Model):
+    """Running stats for a news feed, used to order and skip feeds per niche"""
+    url = models.URLField(max_length=500, unique=True)
+    fetch_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    error_rate = models.FloatField(default=0.0)  # Share of failed fetches, exponentially weighted
+    avg_latency = models.FloatField(default=0.0)  # Seconds, exponentially weighted
+    last_fetched_at = models.DateTimeField(null=True, blank=True)
+    last_changed_at = models.DateTimeField(null=True, blank=True)
+    change_interval = models.FloatField(null=True, blank=True)  # Seconds between content changes
+    niche_yields = models.JSONField(default=dict)  # {niche: {'fetches': n, 'relevant': m}}
+    
+    def yield_for(self, niche):
+        """Relevant articles per fetch for a niche; unseen feeds get an optimistic 1.0"""
+        stats = self.niche_yields.get(niche.lower(), {})
+        return (stats.get('relevant', 0) + 1) / (stats.get('fetches', 0) + 1)
+    
+    def __str__(self):
+        return self.url
+
+
+class NLPCacheEntry(models.Model):
+    """Persisted NLP result for a normalized text, valid for one model version"""
+    kind = models.CharField(max_length=20)  # 'keywords', 'sentiment'
+    version = models.CharField(max_length=100)
+    text_hash = models.CharField(max_length=40)
+    value = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'version', 'text_hash'], name='unique_nlp_cache_entry'),
+        ]
+
+
+class HeadlineFingerprint(models.Model):
+    """MinHash signature of a canonical item's text, for near-duplicate detection"""
+    niche = models.ForeignKey(Niche, on_delete=models.CASCADE)
+    scraped_data = models.OneToOneField(ScrapedData, on_delete=models.CASCADE)
+    signature = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['niche', 'created_at']),
+        ]
+
+
+class DuplicateCopy(models.Model):
+    """Content fingerprint of a near-duplicate collapsed into a canonical item, so it is counted once"""
+    niche = models.ForeignKey(Niche, on_delete=models.CASCADE)
+    canonical = models.ForeignKey(ScrapedData, on_delete=models.CASCADE, related_name='copies')
+    fingerprint = models.CharField(max_length=40)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['niche', 'fingerprint'], name='unique_duplicate_copy'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+
+class NicheTermStats(models.Model):
+    """Running document frequencies of hashed n-grams for a niche (null: all niches)"""
+    niche = models.OneToOneField(Niche, on_delete=models.CASCADE, null=True, blank=True)
+    n_features = models.PositiveIntegerField()
+    n_docs = models.PositiveIntegerField(default=0)
+    doc_freq = models.BinaryField()  # zlib-compressed int32 array of n_features counts
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.niche.name if self.niche else 'Global'}: {self.n_docs} documents"
@@ -1,9 +1,35 @@
 # core/scrapers/ai_marketplace_scraper.py
-import requests
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from .base_scraper import BaseScraper
 from datetime import datetime
 
+# Process-wide state shared by every AIMarketplaceScraper instance: the API
+# health check, API results per target URL, and calls currently in flight
+_api_health = {'ok': None, 'checked_at': None, 'probe': None}  # probe: Future of a check in progress
+_api_health_lock = threading.Lock()
+_result_cache = {}  # url -> (expires_at, products)
+_in_flight = {}  # url -> Future
+_in_flight_lock = threading.Lock()
+
+
+class CallBudget:
+    """Thread-safe count of paid API calls still allowed in a run"""
+    
+    def __init__(self, calls):
+        self.remaining = calls
+        self.lock = threading.Lock()
+    
+    def take(self):
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
 class AIMarketplaceScraper(BaseScraper):
     def __init__(self):
         super().__init__()
@@ -29,58 +55,145 @@ class AIMarketplaceScraper(BaseScraper):
             'fashion': ['dress', 'shoes', 'handbag'],
             'home appliances': ['refrigerator', 'microwave', 'blender'],
         }
+        
+        # Quota / latency controls
+        self.health_check_url = "https://www.jumia.co.ke/catalog/?q=laptop"
+        self.health_retry_after = 600  # Seconds before re-checking a failed API
+        self.result_ttl = 3600  # Seconds an API result is reused for the same URL
+        self.max_calls_per_run = 20
+        self.max_workers = 4
+        self.products_per_call = 3  # parse_ai_response_advanced keeps at most 3
+        self.budget = None  # Shared by all niches between start_run() and end_run()
+    
+    def start_run(self):
+        """One API call budget for the whole multi-niche run"""
+        self.budget = CallBudget(self.max_calls_per_run)
+    
+    def end_run(self):
+        self.budget = None
     
     def scrape(self, niche, limit=8):
-        """Use AI Web Scraper with better error handling"""
+        """Use AI Web Scraper with cached health check, result cache and a call budget"""
         print(f"🤖 AI Scraping marketplaces for '{niche}'...")
         
-        all_products = []
-        search_terms = self.niche_terms.get(niche.lower(), [niche])
-        
-        # Test the API first with a simple URL
-        test_url = "https://www.jumia.co.ke/catalog/?q=laptop"
-        print(f"  🔧 Testing API with Jumia...")
-        
-        test_response = self.scrape_with_ai(test_url, "jumia", "laptop")
-        if test_response:
-            print(f"  ✅ API is working! Format: {type(test_response)}")
-            if isinstance(test_response, dict):
-                print(f"  📊 Response keys: {list(test_response.keys())}")
-        else:
-            print(f"  ❌ API test failed")
+        if not self.check_api():
+            print("  ❌ API health check failed")
             # Return contextual mock data for now
             return self.get_smart_mock_products(niche, limit)
         
-        # Continue with actual scraping
-        for marketplace, base_url in self.marketplace_urls.items():
-            if len(all_products) >= limit:
-                break
+        budget = self.budget if self.budget is not None else CallBudget(self.max_calls_per_run)
+        search_terms = self.niche_terms.get(niche.lower(), [niche])
+        jobs = [
+            (marketplace, search_term)
+            for marketplace in self.marketplace_urls
+            for search_term in search_terms[:2]
+        ]
+        
+        all_products = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Run calls in waves sized to what is still needed to reach limit
+            while jobs and len(all_products) < limit:
+                needed = limit - len(all_products)
+                wave_size = min(self.max_workers, -(-needed // self.products_per_call))
+                wave, jobs = jobs[:wave_size], jobs[wave_size:]
                 
-            for search_term in search_terms[:2]:
-                if len(all_products) >= limit:
-                    break
-                    
-                try:
-                    url = base_url.format(query=search_term.replace(' ', '+'))
-                    print(f"  🔍 Scraping {marketplace} for '{search_term}'...")
-                    
-                    products = self.scrape_with_ai(url, marketplace, search_term)
-                    if products:
-                        all_products.extend(products)
-                        print(f"    ✅ Found {len(products)} products")
-                    else:
-                        print(f"    ⚠️ No products found, using smart mock data")
-                        # Add smart mock data when API fails
-                        mock_products = self.get_smart_mock_products_for_marketplace(marketplace, search_term, 2)
-                        all_products.extend(mock_products)
-                        
-                except Exception as e:
-                    print(f"    💥 Error: {e}")
-                    continue
+                results = executor.map(lambda job: self.scrape_job(*job, budget), wave)
+                for (marketplace, search_term), products in zip(wave, results):
+                    all_products.extend(products)
         
         print(f"📦 AI Scraping Complete: {len(all_products)} total products")
         return all_products[:limit]
     
+    def scrape_job(self, marketplace, search_term, budget):
+        """Scrape one marketplace / search term, falling back to smart mock data"""
+        try:
+            url = self.marketplace_urls[marketplace].format(query=search_term.replace(' ', '+'))
+            print(f"  🔍 Scraping {marketplace} for '{search_term}'...")
+            
+            products = self.fetch_products(url, marketplace, search_term, budget)
+            if products:
+                print(f"    ✅ Found {len(products)} products")
+                return products
+            
+            print("    ⚠️ No products found, using smart mock data")
+            # Add smart mock data when API fails
+            return self.get_smart_mock_products_for_marketplace(marketplace, search_term, 2)
+            
+        except Exception as e:
+            print(f"    💥 Error: {e}")
+            return []
+    
+    def check_api(self):
+        """
+        Health check run once per process (a failure is retried after
+        health_retry_after). One thread sends the probe; threads arriving
+        meanwhile wait for its outcome instead of holding the lock.
+        """
+        with _api_health_lock:
+            if _api_health['ok'] is True:
+                return True
+            if _api_health['ok'] is False and \
+                    time.monotonic() - _api_health['checked_at'] < self.health_retry_after:
+                return False
+            future = _api_health['probe']
+            owner = future is None
+            if owner:
+                future = _api_health['probe'] = Future()
+        
+        if not owner:
+            return future.result()
+        
+        ok = False
+        try:
+            print("  🔧 Testing API with Jumia...")
+            test_response = self.scrape_with_ai(self.health_check_url, "jumia", "laptop")
+            ok = bool(test_response)
+            if test_response:
+                print("  ✅ API is working!")
+                # The probe is a real result; keep it for the first niche that needs it
+                _result_cache[self.health_check_url] = (time.monotonic() + self.result_ttl, test_response)
+        finally:
+            with _api_health_lock:
+                _api_health['ok'] = ok
+                _api_health['checked_at'] = time.monotonic()
+                _api_health['probe'] = None
+            future.set_result(ok)
+        return ok
+    
+    def fetch_products(self, url, marketplace, search_term, budget):
+        """
+        API products for a target URL. Fresh results are served from the
+        cache, identical URLs already in flight (e.g. from another niche) are
+        awaited rather than requested again, and new calls spend the budget.
+        Returns None once the budget is exhausted.
+        """
+        cached = _result_cache.get(url)
+        if cached and cached[0] > time.monotonic():
+            return list(cached[1])
+        
+        with _in_flight_lock:
+            future = _in_flight.get(url)
+            owner = future is None
+            if owner:
+                if not budget.take():
+                    print(f"    💸 API call budget exhausted, skipping {marketplace}")
+                    return None
+                future = _in_flight[url] = Future()
+        
+        if not owner:
+            return list(future.result())
+        
+        products = []
+        try:
+            products = self.scrape_with_ai(url, marketplace, search_term)
+            if products:
+                _result_cache[url] = (time.monotonic() + self.result_ttl, products)
+        finally:
+            future.set_result(products)
+            with _in_flight_lock:
+                _in_flight.pop(url, None)
+        return list(products)
+    
     def scrape_with_ai(self, url, marketplace, search_term):
         """Use RapidAPI AI Web Scraper with better response handling"""
         try:
@@ -95,7 +208,8 @@ class AIMarketplaceScraper(BaseScraper):
                 "x-rapidapi-key": self.api_key
             }
             
-            response = requests.post(self.api_url, json=payload, headers=headers, timeout=30)
+            # Reuse the session's pooled connection to the API host
+            response = self.session.post(self.api_url, json=payload, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 return self.parse_ai_response_advanced(response.json(), marketplace, search_term, url)
@@ -1,10 +1,12 @@
 # core/scrapers/amazon_scraper.py 
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from .html_parsing import parsed
 import random
 import time
 
 class AmazonScraper(BaseScraper):
+    cache_ttl = 3600
+    
     def __init__(self):
         super().__init__()
         # Better headers to mimic real browser
@@ -32,7 +34,6 @@ class AmazonScraper(BaseScraper):
                 print("    Amazon: Blocked by CAPTCHA")
                 return self.get_mock_amazon_data(niche, limit)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
             products = []
             
             # Try multiple selectors for product elements
@@ -42,15 +43,16 @@ class AmazonScraper(BaseScraper):
                 '.s-main-slot .s-result-item'
             ]
             
-            for selector in selectors:
-                product_elements = soup.select(selector)
-                if product_elements:
-                    break
-            
-            for element in product_elements[:limit]:
-                product_data = self.extract_product_data(element)
-                if product_data:
-                    products.append(product_data)
+            with parsed(response.content) as soup:
+                for selector in selectors:
+                    product_elements = soup.select(selector)
+                    if product_elements:
+                        break
+                
+                for element in product_elements[:limit]:
+                    product_data = self.extract_product_data(element)
+                    if product_data:
+                        products.append(product_data)
             
             # If no products found, return mock data for testing
             if not products:
@@ -1,32 +1,101 @@
 # core/scrapers/base_scraper.py
 import abc
+import random
 import requests
 import time
 from datetime import datetime
 from typing import List, Dict, Any
 
+from .circuit_breaker import breakers
+from .rate_limiter import host_limiter
+from .response_cache import get_response_cache
+
 class BaseScraper(abc.ABC):
+    # Requests per second and burst size allowed per host; override per
+    # scraper or through the 'rate_limit' key of the DataSource config
+    default_rate_limit = {'rate': 1.0, 'burst': 1}
+    
+    # (connect, read) timeouts and retry policy for transient failures
+    timeout = (5, 10)
+    max_retries = 2
+    backoff_base = 0.5
+    backoff_cap = 8.0
+    retry_statuses = {429, 500, 502, 503, 504}
+    
+    # Seconds a plain GET response is served from the on-disk cache (0 = off);
+    # overridden per scraper or through the 'cache_ttl' key of the DataSource config
+    cache_ttl = 0
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.rate_limit_config = dict(self.default_rate_limit)
     
     @abc.abstractmethod
     def scrape(self, niche: str, **kwargs) -> List[Dict[str, Any]]:
         """Main scraping method to be implemented by each scraper"""
         pass
     
+    def configure(self, config: Dict[str, Any]):
+        """Apply a DataSource config, e.g. {'rate_limit': {'rate': 0.5, 'burst': 2}, 'cache_ttl': 600}"""
+        self.rate_limit_config.update(config.get('rate_limit', {}))
+        self.cache_ttl = config.get('cache_ttl', self.cache_ttl)
+    
+    def start_run(self):
+        """Hook called once before a multi-niche run"""
+        pass
+    
+    def end_run(self):
+        """Hook called once after a multi-niche run"""
+        pass
+    
     def make_request(self, url, method='GET', **kwargs):
-        """Safe request method with error handling"""
-        try:
-            response = self.session.request(method, url, timeout=10, **kwargs)
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            print(f"Request failed for {url}: {e}")
+        """Safe request method with caching, retries, backoff and a per-host circuit breaker"""
+        # Only plain GETs are cached; extra headers/params (e.g. conditional GETs) bypass it
+        cacheable = self.cache_ttl > 0 and method.upper() == 'GET' and not kwargs
+        if cacheable:
+            cached = get_response_cache().get(method, url, self.cache_ttl)
+            if cached is not None:
+                return cached
+        
+        if not breakers.allow(url):
+            print(f"Skipping {url}: circuit open for this host")
             return None
+        
+        for attempt in range(self.max_retries + 1):
+            self.rate_limit(url)
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                response.raise_for_status()
+                breakers.record_success(url)
+                if cacheable and response.status_code == 200:
+                    get_response_cache().set(method, url, response)
+                return response
+            except requests.RequestException as e:
+                if attempt < self.max_retries and self.is_transient(e):
+                    time.sleep(self.backoff_delay(attempt))
+                    continue
+                print(f"Request failed for {url}: {e}")
+                # A 4xx means the host is up, the URL is just wrong
+                if self.is_transient(e):
+                    breakers.record_failure(url)
+                else:
+                    breakers.record_success(url)
+                return None
+    
+    def is_transient(self, error):
+        """Connection problems, timeouts, throttling and 5xx are worth retrying"""
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        response = getattr(error, 'response', None)
+        return response is not None and response.status_code in self.retry_statuses
+    
+    def backoff_delay(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
     
-    def rate_limit(self, delay=1):
-        """Respect rate limiting"""
-        time.sleep(delay)
\ No newline at end of file
+    def rate_limit(self, url):
+        """Wait for the per-host token bucket shared by all scrapers"""
+        host_limiter.acquire(url, owner=type(self).__name__, **self.rate_limit_config)
\ No newline at end of file
@@ -0,0 +1,111 @@
+# core/scrapers/circuit_breaker.py
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one host.
+    closed -> open after failure_threshold failures in a row; open -> half_open
+    once cooldown seconds have passed, letting a single probe through; the
+    probe's outcome closes the circuit again or re-opens it.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, cooldown=300):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a request may be sent now"""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+            # Half-open: only one probe at a time (a lost probe expires after cooldown)
+            now = time.monotonic()
+            if self.probe_started is not None and now - self.probe_started < self.cooldown:
+                return False
+            self.probe_started = now
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def record_failure(self):
+        """Count a failure; returns True if this failure opened the circuit"""
+        with self.lock:
+            self.failures += 1
+            self.probe_started = None
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                opened = self.state != self.OPEN
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return opened
+            return False
+
+    def as_dict(self):
+        with self.lock:
+            retry_in = None
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+            return {'state': self.state, 'failures': self.failures, 'retry_in': retry_in}
+
+
+class BreakerRegistry:
+    """Circuit breakers keyed by host, shared by every scraper in the process"""
+
+    def __init__(self, failure_threshold=3, cooldown=300):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.cooldown)
+            return self._breakers[host]
+
+    def allow(self, url):
+        return self.get(url).allow()
+
+    def record_success(self, url):
+        self.get(url).record_success()
+
+    def record_failure(self, url):
+        if self.get(url).record_failure():
+            print(f"⛔ Circuit opened for {urlparse(url).netloc} ({self.cooldown}s cool-down)")
+
+    def states(self):
+        """Snapshot of every host's breaker, e.g. for logging or the admin shell"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.as_dict() for host, breaker in breakers.items()}
+
+    def open_hosts(self):
+        return [host for host, state in self.states().items() if state['state'] != CircuitBreaker.CLOSED]
+
+    def reset(self):
+        with self._lock:
+            self._breakers.clear()
+
+
+# One registry per worker process so a dead host is skipped by every scraper
+breakers = BreakerRegistry()
@@ -0,0 +1,28 @@
+# core/scrapers/feed_snapshot.py
+import threading
+
+
+class FeedSnapshot:
+    """Run-scoped store of parsed feeds, so each feed is fetched at most once per run"""
+
+    def __init__(self):
+        self._feeds = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def get(self, feed_url, fetch):
+        """Return the parsed feed, calling fetch(feed_url) only on first use"""
+        with self._lock_for(feed_url):
+            if feed_url not in self._feeds:
+                self._feeds[feed_url] = fetch(feed_url)
+            return self._feeds[feed_url]
+
+    def _lock_for(self, feed_url):
+        # Per-feed lock: concurrent niches wait for one download instead of racing
+        with self._guard:
+            if feed_url not in self._locks:
+                self._locks[feed_url] = threading.Lock()
+            return self._locks[feed_url]
+
+    def __len__(self):
+        return len(self._feeds)
@@ -0,0 +1,69 @@
+# core/scrapers/html_parsing.py
+import re
+from contextlib import contextmanager
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_BACKEND = 'lxml'
+except ImportError:
+    DEFAULT_BACKEND = 'html.parser'
+
+# Selectors simple enough to turn into a SoupStrainer: tag, .class, [attr],
+# [attr="value"] and combinations of one tag with classes / attributes
+_SIMPLE_SELECTOR = re.compile(r'^[\w-]*(?:\.[\w-]+|\[[\w-]+(?:="[^"]*")?\])*$')
+_CLASS = re.compile(r'\.([\w-]+)')
+_ATTR = re.compile(r'\[([\w-]+)(?:="([^"]*)")?\]')
+
+
+def make_soup(markup, parse_only=None, backend=None):
+    """Build a BeautifulSoup tree with the fast backend, optionally scoped by a strainer"""
+    return BeautifulSoup(markup, backend or DEFAULT_BACKEND, parse_only=parse_only)
+
+
+def strainer_for(selector):
+    """
+    SoupStrainer keeping only elements matching a simple CSS selector (and
+    their subtrees), or None when the selector is too complex to scope.
+    """
+    selector = selector.strip()
+    if not selector or not _SIMPLE_SELECTOR.match(selector):
+        return None
+
+    name = re.match(r'^[\w-]*', selector).group() or None
+    rest = selector[len(name or ''):]
+    attrs = {}
+
+    classes = _CLASS.findall(re.sub(r'\[[^\]]*\]', '', rest))
+    if classes:
+        attrs['class'] = _has_classes(classes)
+    for attr, value in _ATTR.findall(rest):
+        attrs[attr] = value if value else True
+
+    if name is None and not attrs:
+        return None
+    return SoupStrainer(name, attrs=attrs)
+
+
+def _has_classes(classes):
+    # At parse time the class attribute is still the raw "a b c" string
+    def match(value):
+        if not value:
+            return False
+        present = value.split() if isinstance(value, str) else value
+        return all(c in present for c in classes)
+    return match
+
+
+@contextmanager
+def parsed(markup, scope=None, backend=None):
+    """
+    Parse markup (only the subtrees matching the `scope` selector when it is
+    simple enough) and free the tree as soon as the block exits.
+    """
+    soup = make_soup(markup, parse_only=strainer_for(scope) if scope else None, backend=backend)
+    try:
+        yield soup
+    finally:
+        soup.decompose()
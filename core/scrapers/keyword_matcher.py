@@ -0,0 +1,92 @@
+# core/scrapers/keyword_matcher.py
+import re
+from functools import lru_cache
+
+# Points per keyword found anywhere in the text, plus a bonus when it is a whole word
+SUBSTRING_POINTS = 5
+WORD_POINTS = 10
+MAX_SCORE = 100
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def resolve_niche_keywords(mapping, niche):
+    """Keyword list of the first mapping key overlapping the niche name, else the niche itself"""
+    niche_lower = niche.lower()
+    for key, keywords in mapping.items():
+        if key in niche_lower or niche_lower in key:
+            return list(keywords)
+    return [niche_lower]
+
+
+class KeywordMatcher:
+    """
+    All of a niche's keywords compiled into one regex, so a text is scanned
+    once for every keyword.
+
+    A zero-width lookahead alternation (longest keywords first) reports the
+    longest keyword starting at each position; shorter keywords that are
+    prefixes of it start there too. Word-boundary checks reproduce
+    re.search(r'\\b' + keyword + r'\\b') exactly.
+    """
+
+    def __init__(self, keywords):
+        # lowered keyword -> [list entries, entries that can match as substrings]
+        # Keywords with capitals ('IT') never occur in the lowered text as a plain
+        # substring, but still match as a case-insensitive whole word
+        self.counts = {}
+        for keyword in keywords:
+            counts = self.counts.setdefault(keyword.lower(), [0, 0])
+            counts[0] += 1
+            counts[1] += keyword == keyword.lower()
+
+        ordered = sorted(self.counts, key=len, reverse=True)
+        self.pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(k) for k in ordered) + '))'
+        ) if ordered else None
+        self.prefixes = {
+            k: [p for p in ordered if k.startswith(p)] for k in ordered
+        }
+
+    def match(self, text):
+        """(whole-word keyword matches, relevance score 0-100) for an already lowered text"""
+        found, words = set(), set()
+        if self.pattern is not None:
+            for m in self.pattern.finditer(text):
+                start = m.start()
+                for keyword in self.prefixes[m.group(1)]:
+                    found.add(keyword)
+                    if keyword not in words and _is_word(text, start, start + len(keyword)):
+                        words.add(keyword)
+
+        matches = score = 0
+        for keyword in found:
+            entries, substring_entries = self.counts[keyword]
+            whole_word = keyword in words
+            if whole_word:
+                matches += entries
+            score += substring_entries * (SUBSTRING_POINTS + (WORD_POINTS if whole_word else 0))
+        return matches, min(score, MAX_SCORE)
+
+
+def _is_word(text, start, end):
+    return _boundary(text, start) and _boundary(text, end)
+
+
+def _boundary(text, pos):
+    before = pos > 0 and _WORD_CHAR.match(text, pos - 1) is not None
+    after = pos < len(text) and _WORD_CHAR.match(text, pos) is not None
+    return before != after
+
+
+@lru_cache(maxsize=64)
+def _compile(keywords):
+    return KeywordMatcher(keywords)
+
+
+def matcher_for(keywords):
+    """
+    Shared matcher for a keyword list. The cache is keyed on the keywords
+    themselves, so editing a niche's keyword list yields a new matcher.
+    """
+    return _compile(tuple(keywords))
@@ -1,12 +1,17 @@
 # core/scrapers/marketplace_scraper.py
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from .html_parsing import parsed
 import json
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 from datetime import datetime
 
 class MarketplaceScraper(BaseScraper):
+    # Search result pages are reused across niches sharing search terms
+    cache_ttl = 3600
+    
     def __init__(self):
         super().__init__()
         # Enhanced headers to mimic real browsers
@@ -20,6 +25,11 @@ class MarketplaceScraper(BaseScraper):
             'Upgrade-Insecure-Requests': '1',
         })
         
+        # Concurrent mode: marketplaces run in parallel (each host still
+        # rate limited) and the whole pass gives up after deadline seconds
+        self.max_workers = 6
+        self.deadline = 90
+        
         # Marketplace configurations
         self.marketplaces = {
             # International
@@ -241,39 +251,86 @@ class MarketplaceScraper(BaseScraper):
             ]
         }
     
-    def scrape(self, niche, limit=15):
+    def scrape(self, niche, limit=15, concurrent=True, deadline=None):
         """Scrape all marketplaces for a specific niche"""
         print(f"🛒 Scraping marketplaces for '{niche}'...")
         
         all_products = []
         successful_marketplaces = 0
         
-        # Get search terms for this niche
+        if concurrent:
+            results = self.iter_scrape(niche, limit, deadline)
+        else:
+            results = self.iter_scrape_serial(niche, limit)
+        
+        for marketplace_name, products in results:
+            if products:
+                all_products.extend(products[:limit - len(all_products)])
+                successful_marketplaces += 1
+                print(f"  ✅ {marketplace_name}: {len(products)} products")
+            else:
+                print(f"  ❌ {marketplace_name}: 0 products")
+        
+        print(f"📦 Total: {len(all_products)} products from {successful_marketplaces} marketplaces")
+        return all_products[:limit]
+    
+    def iter_scrape_serial(self, niche, limit):
+        """Yield (marketplace, products) one marketplace at a time"""
         search_terms = self.get_search_terms(niche)
+        found = 0
         
-        for marketplace_name, config in self.marketplaces.items():
-            if len(all_products) >= limit:
+        for marketplace_name in self.marketplaces:
+            if found >= limit:
                 break
                 
             try:
-                products = self.scrape_marketplace(marketplace_name, search_terms, 
-                                                 limit - len(all_products))
-                if products:
-                    all_products.extend(products)
-                    successful_marketplaces += 1
-                    print(f"  ✅ {marketplace_name}: {len(products)} products")
-                else:
-                    print(f"  ❌ {marketplace_name}: 0 products")
-                
-                # Respectful delay
-                time.sleep(1)
-                
+                products = self.scrape_marketplace(marketplace_name, search_terms, limit - found)
             except Exception as e:
                 print(f"  💥 {marketplace_name}: Error - {e}")
                 continue
+            
+            found += len(products)
+            yield marketplace_name, products
+    
+    def iter_scrape(self, niche, limit, deadline=None):
+        """
+        Yield (marketplace, products) as each marketplace completes.
+        Stops once limit products have been yielded or the deadline passes;
+        marketplaces not finished by then are cancelled.
+        """
+        search_terms = self.get_search_terms(niche)
+        deadline = self.deadline if deadline is None else deadline
+        stop_at = time.monotonic() + deadline
+        cancelled = threading.Event()
+        found = 0
         
-        print(f"📦 Total: {len(all_products)} products from {successful_marketplaces} marketplaces")
-        return all_products[:limit]
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                executor.submit(self.scrape_marketplace, name, search_terms, limit, cancelled): name
+                for name in self.marketplaces
+            }
+            
+            try:
+                for future in as_completed(futures, timeout=max(0, stop_at - time.monotonic())):
+                    marketplace_name = futures[future]
+                    try:
+                        products = future.result()
+                    except Exception as e:
+                        print(f"  💥 {marketplace_name}: Error - {e}")
+                        continue
+                    
+                    found += len(products)
+                    yield marketplace_name, products
+                    
+                    if found >= limit:
+                        break
+            except TimeoutError:
+                pending = [name for future, name in futures.items() if not future.done()]
+                print(f"  ⏱️ Deadline of {deadline}s reached, skipping: {', '.join(pending)}")
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def get_search_terms(self, niche):
         """Get relevant search terms for a niche"""
@@ -287,7 +344,7 @@ class MarketplaceScraper(BaseScraper):
         # Default to niche name if no match
         return [niche_lower]
     
-    def scrape_marketplace(self, marketplace_name, search_terms, limit):
+    def scrape_marketplace(self, marketplace_name, search_terms, limit, cancelled=None):
         """Scrape a specific marketplace"""
         config = self.marketplaces[marketplace_name]
         products = []
@@ -295,6 +352,8 @@ class MarketplaceScraper(BaseScraper):
         for search_term in search_terms:
             if len(products) >= limit:
                 break
+            if cancelled is not None and cancelled.is_set():
+                break
                 
             try:
                 url = config['base_url'].format(query=search_term.replace(' ', '+'))
@@ -308,9 +367,10 @@ class MarketplaceScraper(BaseScraper):
                     print(f"    ⚠️ {marketplace_name}: Blocked, using mock data")
                     return self.get_mock_products(marketplace_name, search_terms, limit)
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                marketplace_products = self.parse_products(soup, config['selectors'], 
-                                                         marketplace_name, search_term)
+                # Only the product containers are parsed; the tree is freed right after
+                with parsed(response.content, scope=config['selectors']['products']) as soup:
+                    marketplace_products = self.parse_products(soup, config['selectors'], 
+                                                             marketplace_name, search_term)
                 
                 products.extend(marketplace_products)
                 
@@ -6,6 +6,8 @@ from .amazon_scraper import AmazonScraper
 from .news_scraper import NewsScraper
 from .marketplace_scraper import MarketplaceScraper 
 from .ai_marketplace_scraper import AIMarketplaceScraper
+from core.models import DataSource
+from core.services.niche_classifier import NicheClassifier
 
 class MasterScraper:
     def __init__(self):
@@ -51,10 +53,21 @@ class MasterScraper:
         """Scrape multiple niches"""
         all_niche_data = {}
         
-        for niche in niches:
-            print(f"\n🎯 Scraping niche: {niche}")
-            niche_data = self.scrape_all_sources(niche, active_sources)
-            all_niche_data[niche] = niche_data
+        self.start_run()
+        try:
+            prefetched = {}
+            if active_sources is None or 'news' in active_sources:
+                prefetched['news'] = self.prefetch_news(niches)
+            
+            for niche in niches:
+                print(f"\n🎯 Scraping niche: {niche}")
+                niche_data = self.scrape_all_sources(
+                    niche, active_sources,
+                    prefetched={name: data[niche] for name, data in prefetched.items() if niche in data},
+                )
+                all_niche_data[niche] = niche_data
+        finally:
+            self.end_run()
         
         return all_niche_data
 
@@ -68,7 +81,7 @@ class MasterScraper:
             'google_trends': GoogleTrendsScraper(),
         }
     
-    def scrape_all_sources(self, niche, active_sources=None):
+    def scrape_all_sources(self, niche, active_sources=None, prefetched=None):
         if active_sources is None:
             active_sources = ['news', 'ai_marketplace']  # Focus on working sources
         
@@ -79,11 +92,50 @@ class MasterScraper:
                 print(f"Scraping {source_name} for {niche}...")
                 
                 try:
-                    data = self.scrapers[source_name].scrape(niche)
+                    if prefetched and source_name in prefetched:
+                        data = prefetched[source_name]
+                    else:
+                        data = self.scrapers[source_name].scrape(niche)
                     all_data.extend(data)
                     print(f"✅ {source_name}: Found {len(data)} items")
                     
                 except Exception as e:
                     print(f"❌ {source_name} failed: {e}")
         
-        return all_data
\ No newline at end of file
+        return all_data
+    
+    def prefetch_news(self, niches):
+        """
+        News for several niches from one pass over the feeds, each entry
+        classified against all niches at once. Returns {niche: articles};
+        niches missing from it (e.g. after a failure) are scraped one by one.
+        """
+        print(f"\n📰 Scraping news for {len(niches)} niches")
+        try:
+            return self.scrapers['news'].scrape_niches(niches, classifier=self.niche_classifier(niches))
+        except Exception as e:
+            print(f"❌ news failed: {e}")
+            return {}
+    
+    def niche_classifier(self, niches):
+        """Classifier over the news keywords and marketplace categories of the niches"""
+        return NicheClassifier.from_mappings(
+            [self.scrapers['news'].niche_keywords, MarketplaceScraper().niche_categories], niches
+        )
+    
+    def configure_sources(self):
+        """Apply the config of each scraper's global DataSource (rate limits etc.)"""
+        configs = DataSource.objects.filter(niche__isnull=True, name__in=self.scrapers.keys())
+        for source in configs:
+            self.scrapers[source.name].configure(source.config or {})
+    
+    def start_run(self):
+        """Open a run scope: shared work (e.g. feed downloads) is reused across niches"""
+        self.configure_sources()
+        for scraper in self.scrapers.values():
+            scraper.start_run()
+    
+    def end_run(self):
+        """Close the run scope opened by start_run()"""
+        for scraper in self.scrapers.values():
+            scraper.end_run()
\ No newline at end of file
@@ -1,12 +1,25 @@
 # core/scrapers/news_scraper.py
 from .base_scraper import BaseScraper
-import feedparser
-from bs4 import BeautifulSoup
+from .feed_snapshot import FeedSnapshot
+from core.services.feed_cache import fetch_feed
+from core.services.feed_registry import FeedRegistry
+from .html_parsing import parsed
+from .keyword_matcher import matcher_for, resolve_niche_keywords
+from core.services.niche_classifier import NicheClassifier
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-import re
+from django.db import connection
+from itertools import chain, zip_longest
 
 class NewsScraper(BaseScraper):
+    # At most one request every 0.5s per host
+    default_rate_limit = {'rate': 2.0, 'burst': 1}
+    
+    # Homepage HTML for the direct-scrape fallback (feeds use conditional GETs instead)
+    cache_ttl = 900
+    
     def __init__(self):
         super().__init__()
         # Expanded news sources - 20+ reliable feeds
@@ -59,6 +72,16 @@ class NewsScraper(BaseScraper):
             "https://feeds.reuters.com/reuters/topNews",
         ]
         
+        # Concurrent fetching on a bounded pool; per-host politeness comes
+        # from the shared token buckets in rate_limit()
+        self.max_workers = 8
+        
+        # Set between start_run() and end_run() so niches share one download per feed
+        self.snapshot = None
+        
+        # Feed health stats (latency, errors, yield per niche) used to order feeds
+        self.registry = None
+        
         # Enhanced niche keyword mapping for better accuracy
         self.niche_keywords = {
             'technology': [
@@ -168,124 +191,283 @@ class NewsScraper(BaseScraper):
             ]
         }
     
-    def scrape(self, niche, limit=20):
+    def start_run(self):
+        """Fetch each feed at most once until end_run(), whatever the niche count"""
+        self.snapshot = FeedSnapshot()
+        self.registry = FeedRegistry.load(self.feeds)
+    
+    def end_run(self):
+        """Drop the run's feed snapshot and persist feed health stats"""
+        self.snapshot = None
+        if self.registry is not None:
+            self.registry.save()
+            self.registry = None
+    
+    def scrape(self, niche, limit=20, concurrent=True):
         """Scrape all news sources with enhanced relevance filtering"""
-        print(f"    📰 Scraping news for '{niche}' from {len(self.feeds)} sources...")
+        # Outside a run scope the registry lives for this scrape only
+        own_registry = self.registry is None
+        if own_registry:
+            self.registry = FeedRegistry.load(self.feeds)
+        
+        # Highest-yield feeds for the niche first, duplicates and dead feeds dropped
+        feeds = self.registry.order(self.feeds, niche)
+        print(f"    📰 Scraping news for '{niche}' from {len(feeds)} sources...")
+        
+        try:
+            if concurrent:
+                all_articles, successful_feeds = self.scrape_concurrent(feeds, niche, limit)
+            else:
+                all_articles, successful_feeds = self.scrape_serial(feeds, niche, limit)
+        finally:
+            if own_registry:
+                self.registry.save()
+                self.registry = None
         
+        print(f"    📊 Total: {len(all_articles)} articles from {successful_feeds} sources")
+        return all_articles[:limit]
+    
+    def scrape_serial(self, feeds, niche, limit):
+        """Walk the feeds one after another until limit is reached"""
         all_articles = []
         successful_feeds = 0
         
-        for feed_url in self.feeds:
+        for feed_url in feeds:
             if len(all_articles) >= limit:
                 break
                 
             try:
-                articles = self.parse_feed(feed_url, niche, limit - len(all_articles))
-                if articles:
+                articles = self.fetch_feed_articles(feed_url, niche, limit - len(all_articles))
+                if self.log_feed_result(feed_url, articles):
                     all_articles.extend(articles)
                     successful_feeds += 1
-                    print(f"      ✅ {self.get_feed_name(feed_url)}: {len(articles)} relevant articles")
-                else:
-                    print(f"      ❌ {self.get_feed_name(feed_url)}: 0 relevant articles")
-                
-                # Respectful delay between requests
-                time.sleep(0.5)
                 
             except Exception as e:
                 print(f"      💥 {self.get_feed_name(feed_url)}: Error - {e}")
                 continue
         
-        print(f"    📊 Total: {len(all_articles)} articles from {successful_feeds} sources")
-        return all_articles[:limit]
+        return all_articles, successful_feeds
+    
+    def scrape_concurrent(self, feeds, niche, limit):
+        """Fetch feeds on a bounded worker pool, stopping once limit is reached"""
+        all_articles = []
+        successful_feeds = 0
+        done = threading.Event()
+        
+        def fetch(feed_url):
+            # Feeds still queued when the limit is hit are skipped
+            if done.is_set():
+                return None
+            try:
+                return self.fetch_feed_articles(feed_url, niche, limit, cancelled=done)
+            finally:
+                # Feed caching queries open a DB connection per pool thread
+                connection.close()
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {executor.submit(fetch, feed_url): feed_url for feed_url in feeds}
+            
+            for future in as_completed(futures):
+                feed_url = futures[future]
+                try:
+                    articles = future.result()
+                except Exception as e:
+                    print(f"      💥 {self.get_feed_name(feed_url)}: Error - {e}")
+                    continue
+                
+                if articles is None:
+                    continue
+                
+                if self.log_feed_result(feed_url, articles):
+                    all_articles.extend(articles[:limit - len(all_articles)])
+                    successful_feeds += 1
+                
+                if len(all_articles) >= limit:
+                    done.set()
+                    break
+        finally:
+            done.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return all_articles, successful_feeds
+    
+    def scrape_niches(self, niches, limit=20, classifier=None):
+        """
+        Scrape news for several niches at once: every feed is read once and
+        each of its entries is classified against all niches in one pass.
+        Returns {niche: articles}.
+        """
+        if classifier is None:
+            classifier = NicheClassifier.from_mappings([self.niche_keywords], niches)
+        
+        own_registry = self.registry is None
+        if own_registry:
+            self.registry = FeedRegistry.load(self.feeds)
+        
+        # Interleave the niches' feed rankings so each niche's best feeds come early
+        rankings = [self.registry.order(self.feeds, niche) for niche in niches]
+        feeds = [url for url in dict.fromkeys(chain.from_iterable(zip_longest(*rankings))) if url]
+        print(f"    📰 Scraping news for {len(niches)} niches from {len(feeds)} sources...")
+        
+        results = {niche: [] for niche in niches}
+        done = threading.Event()
+        
+        def fetch(feed_url):
+            if done.is_set():
+                return None
+            try:
+                return self.classify_feed(feed_url, classifier, limit)
+            finally:
+                connection.close()
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {executor.submit(fetch, feed_url): feed_url for feed_url in feeds}
+            
+            for future in as_completed(futures):
+                feed_url = futures[future]
+                try:
+                    by_niche = future.result()
+                except Exception as e:
+                    print(f"      💥 {self.get_feed_name(feed_url)}: Error - {e}")
+                    continue
+                
+                if by_niche is None:
+                    continue
+                
+                self.log_feed_result(feed_url, list(chain.from_iterable(by_niche.values())))
+                for niche, articles in by_niche.items():
+                    results[niche].extend(articles[:limit - len(results[niche])])
+                
+                if all(len(articles) >= limit for articles in results.values()):
+                    done.set()
+                    break
+        finally:
+            done.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if own_registry:
+                self.registry.save()
+                self.registry = None
+        
+        for niche, articles in results.items():
+            print(f"    📊 {niche}: {len(articles)} articles")
+        return results
+    
+    def classify_feed(self, feed_url, classifier, limit):
+        """One feed's relevant articles for every niche of the classifier, as {niche: articles}"""
+        by_niche = {niche: [] for niche in classifier.niches}
+        try:
+            feed = self.load_feed(feed_url)
+        except Exception:
+            return by_niche
+        if feed['bozo']:
+            return by_niche
+        
+        entries = [e for e in feed['entries'][:limit * 2] if e.get('title') and e.get('link')]
+        texts = [f"{e.get('title', '')} {e.get('summary', '')}" for e in entries]
+        for entry, labels in zip(entries, classifier.classify(texts)):
+            for niche, relevance in labels:
+                if len(by_niche[niche]) < limit:
+                    by_niche[niche].append(self.make_article(entry, niche, feed_url, relevance))
+        
+        if self.registry is not None:
+            for niche, articles in by_niche.items():
+                self.registry.record_yield(feed_url, niche, len(articles))
+        return by_niche
+    
+    def make_article(self, entry, niche, feed_url, relevance_score):
+        """Article dict for a relevant feed entry"""
+        return {
+            'title': entry['title'],
+            'link': entry['link'],
+            'published': entry.get('published', ''),
+            'summary': entry.get('summary', entry.get('description', '')),
+            'source': 'news',
+            'niche': niche,
+            'feed_url': feed_url,
+            'feed_name': self.get_feed_name(feed_url),
+            'timestamp': datetime.now().isoformat(),
+            'relevance_score': relevance_score
+        }
+    
+    def fetch_feed_articles(self, feed_url, niche, limit, cancelled=None):
+        """Fetch one feed's relevant articles unless the scrape was cancelled"""
+        if cancelled is not None and cancelled.is_set():
+            return None
+        return self.parse_feed(feed_url, niche, limit)
+    
+    def load_feed(self, feed_url):
+        """Return the parsed feed, from the run snapshot when one is active"""
+        if self.snapshot is not None:
+            return self.snapshot.get(feed_url, self.download_feed)
+        return self.download_feed(feed_url)
+    
+    def download_feed(self, feed_url):
+        """Download a feed through make_request (rate limit, retries, circuit breaker)"""
+        started = time.monotonic()
+        feed = fetch_feed(feed_url, get=self.make_request)
+        if self.registry is not None:
+            self.registry.record_fetch(
+                feed_url,
+                latency=time.monotonic() - started,
+                ok=feed['status'] is not None and not feed['bozo'],
+                changed=not feed['not_modified'],
+            )
+        return feed
+    
+    def log_feed_result(self, feed_url, articles):
+        """Print the per-feed outcome and return whether it yielded anything"""
+        if articles:
+            print(f"      ✅ {self.get_feed_name(feed_url)}: {len(articles)} relevant articles")
+            return True
+        print(f"      ❌ {self.get_feed_name(feed_url)}: 0 relevant articles")
+        return False
     
     def parse_feed(self, feed_url, niche, limit):
         """Parse individual RSS feed with strict relevance checking"""
         try:
-            feed = feedparser.parse(feed_url)
+            feed = self.load_feed(feed_url)
             
-            if feed.bozo:
+            if feed['bozo']:
                 return []
             
             articles = []
             
-            for entry in feed.entries[:limit * 2]:  # Check more entries for relevance
+            for entry in feed['entries'][:limit * 2]:  # Check more entries for relevance
                 try:
                     # Strict relevance checking
-                    if self.is_highly_relevant(entry, niche):
-                        articles.append({
-                            'title': entry.title,
-                            'link': entry.link,
-                            'published': entry.get('published', ''),
-                            'summary': entry.get('summary', entry.get('description', '')),
-                            'source': 'news',
-                            'niche': niche,
-                            'feed_url': feed_url,
-                            'feed_name': self.get_feed_name(feed_url),
-                            'timestamp': datetime.now().isoformat(),
-                            'relevance_score': self.calculate_relevance_score(entry, niche)
-                        })
+                    matches, score = self.match_niche(entry, niche)
+                    if matches >= 2:
+                        articles.append(self.make_article(entry, niche, feed_url, score))
                 except Exception as e:
                     continue
                 
                 if len(articles) >= limit:
                     break
             
+            if self.registry is not None:
+                self.registry.record_yield(feed_url, niche, len(articles))
+            
             return articles
             
         except Exception as e:
             return []
     
+    def match_niche(self, entry, niche):
+        """(keyword matches, relevance score 0-100) for an entry, in one pass over its text"""
+        text = f"{entry.get('title', '')} {entry.get('summary', '')}".lower()
+        return matcher_for(resolve_niche_keywords(self.niche_keywords, niche)).match(text)
+    
     def is_highly_relevant(self, entry, niche):
         """Strict relevance checking using niche-specific keywords"""
-        text = f"{entry.title} {entry.get('summary', '')}".lower()
-        niche_lower = niche.lower()
-        
-        # Get keywords for this niche
-        keywords = []
-        for key, key_keywords in self.niche_keywords.items():
-            if key in niche_lower or niche_lower in key:
-                keywords.extend(key_keywords)
-                break
-        
-        # If no specific niche match, use broad matching
-        if not keywords:
-            keywords = [niche_lower]
-        
-        # Count keyword matches
-        matches = 0
-        for keyword in keywords:
-            if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-                matches += 1
-                if matches >= 2:  # Require at least 2 keyword matches
-                    return True
-        
-        return matches >= 2
+        matches, _ = self.match_niche(entry, niche)
+        return matches >= 2  # Require at least 2 keyword matches
     
     def calculate_relevance_score(self, entry, niche):
         """Calculate how relevant an article is to the niche (0-100)"""
-        text = f"{entry.title} {entry.get('summary', '')}".lower()
-        niche_lower = niche.lower()
-        
-        # Get keywords for this niche
-        keywords = []
-        for key, key_keywords in self.niche_keywords.items():
-            if key in niche_lower or niche_lower in key:
-                keywords.extend(key_keywords)
-                break
-        
-        if not keywords:
-            keywords = [niche_lower]
-        
-        # Calculate score based on keyword matches
-        score = 0
-        for keyword in keywords:
-            if keyword in text:
-                score += 5  # Base points for each keyword match
-                # Bonus points for exact word matches
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE):
-                    score += 10
-        
-        return min(score, 100)  # Cap at 100
+        _, score = self.match_niche(entry, niche)
+        return score
     
     def get_feed_name(self, feed_url):
         """Extract feed name from URL for better logging"""
@@ -346,38 +528,41 @@ class NewsScraper(BaseScraper):
             if not response:
                 return []
             
-            soup = BeautifulSoup(response.content, 'html.parser')
             articles = []
             
-            for selector in selectors:
-                elements = soup.select(selector)
-                for element in elements[:limit * 2]:
-                    title = element.get_text(strip=True)
-                    link = element.get('href', '')
-                    
-                    if title and len(title) > 10 and self.is_highly_relevant({'title': title}, niche):
-                        # Make absolute URL if relative
-                        if link.startswith('/'):
-                            link = url + link
+            with parsed(response.content) as soup:
+                for selector in selectors:
+                    elements = soup.select(selector)
+                    for element in elements[:limit * 2]:
+                        title = element.get_text(strip=True)
+                        link = element.get('href', '')
                         
-                        articles.append({
-                            'title': title,
-                            'link': link,
-                            'published': '',
-                            'summary': '',
-                            'source': 'news_direct',
-                            'niche': niche,
-                            'feed_url': url,
-                            'feed_name': url.split('//')[-1].split('/')[0],
-                            'timestamp': datetime.now().isoformat(),
-                            'relevance_score': self.calculate_relevance_score({'title': title}, niche)
-                        })
-                        
-                        if len(articles) >= limit:
-                            break
-                
-                if len(articles) >= limit:
-                    break
+                        if not title or len(title) <= 10:
+                            continue
+                        matches, score = self.match_niche({'title': title}, niche)
+                        if matches >= 2:
+                            # Make absolute URL if relative
+                            if link.startswith('/'):
+                                link = url + link
+                            
+                            articles.append({
+                                'title': title,
+                                'link': link,
+                                'published': '',
+                                'summary': '',
+                                'source': 'news_direct',
+                                'niche': niche,
+                                'feed_url': url,
+                                'feed_name': url.split('//')[-1].split('/')[0],
+                                'timestamp': datetime.now().isoformat(),
+                                'relevance_score': score
+                            })
+                            
+                            if len(articles) >= limit:
+                                break
+                    
+                    if len(articles) >= limit:
+                        break
             
             return articles
             
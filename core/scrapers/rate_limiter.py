@@ -0,0 +1,91 @@
+# core/scrapers/rate_limiter.py
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` requests per second with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Going negative queues the caller behind earlier reservations
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available (the lock is not held while sleeping)"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def set_budget(self, rate, burst):
+        """Change the rate and burst; tokens earned so far are kept, up to the new burst"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.rate = float(rate)
+            self.burst = float(burst)
+            self.tokens = min(self.tokens, self.burst)
+
+
+class HostRateLimiter:
+    """
+    Per-host token buckets shared by every scraper in the process.
+
+    Each owner (scraper) using a host has its own budget for it, the one it
+    last asked for, and the host's bucket runs at the strictest of them. A
+    budget raised in an owner's config therefore takes effect on its next
+    request, without a restart.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._budgets = {}  # host -> {owner: (rate, burst)}
+        self._lock = threading.Lock()
+
+    def bucket(self, host, rate, burst=1, owner=None):
+        """Return the host's bucket, creating it or updating its budget as needed"""
+        budget = (float(rate), float(burst))
+        with self._lock:
+            budgets = self._budgets.setdefault(host, {})
+            bucket = self._buckets.get(host)
+            if bucket is not None and budgets.get(owner) == budget:
+                return bucket
+            budgets[owner] = budget
+            rate = min(r for r, _ in budgets.values())
+            burst = min(b for _, b in budgets.values())
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            elif (rate, burst) != (bucket.rate, bucket.burst):
+                bucket.set_budget(rate, burst)
+            return bucket
+
+    def acquire(self, url, rate, burst=1, owner=None):
+        """Wait for the budget of the host serving url"""
+        host = urlparse(url).netloc.lower()
+        return self.bucket(host, rate, burst, owner).acquire()
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self._budgets.clear()
+
+
+# One limiter per worker process so different scrapers share each host's budget
+host_limiter = HostRateLimiter()
@@ -0,0 +1,168 @@
+# core/scrapers/response_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Headers describing the wire encoding, which no longer applies to the stored body
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of GET responses.
+    Entries are keyed by a SHA-256 of the request; each entry is a body file
+    plus a small JSON metadata file. Freshness is checked against a TTL given
+    on read, reads bump the entry's mtime, and the least recently used entries
+    are evicted once the directory grows past max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self._size = None  # Bytes on disk, computed lazily
+        self._lock = threading.Lock()
+
+    def key(self, method, url):
+        return hashlib.sha256(f"{method.upper()} {url}".encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        folder = os.path.join(self.directory, key[:2])
+        return os.path.join(folder, key + '.json'), os.path.join(folder, key + '.body')
+
+    def get(self, method, url, ttl):
+        """Return a cached requests.Response younger than ttl seconds, or None"""
+        meta_path, body_path = self._paths(self.key(method, url))
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if time.time() - meta['stored_at'] > ttl:
+                return None
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            # mtime doubles as the LRU clock
+            os.utime(body_path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.reason = meta.get('reason', '')
+        response.url = meta['url']
+        response.encoding = meta.get('encoding')
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response._content = body
+        response.from_cache = True
+        return response
+
+    def set(self, method, url, response):
+        """Store a response, evicting old entries if the cache is over its size cap"""
+        meta_path, body_path = self._paths(self.key(method, url))
+        meta = {
+            'url': response.url or url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'encoding': response.encoding,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            'stored_at': time.time(),
+        }
+        body = response.content
+        try:
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            previous = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+            self._atomic_write(body_path, body)
+            self._atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            print(f"Response cache write failed for {url}: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += len(body) - previous
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self, target_ratio=0.8):
+        """Delete least recently used entries until usage is below target_ratio of the cap"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.body'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(e[1] for e in entries)
+        target = self.max_bytes * target_ratio
+        for _, entry_size, path in sorted(entries):
+            if size <= target:
+                break
+            for stale in (path, path[:-len('.body')] + '.json'):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            size -= entry_size
+
+        with self._lock:
+            self._size = size
+
+    def clear(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    pass
+        with self._lock:
+            self._size = 0
+
+    def _disk_usage(self):
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.body'):
+                    try:
+                        total += os.path.getsize(os.path.join(root, name))
+                    except OSError:
+                        pass
+        return total
+
+    def _atomic_write(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide cache configured from SCRAPER_CACHE_DIR / SCRAPER_CACHE_MAX_BYTES"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            from django.conf import settings
+            _response_cache = ResponseCache(
+                settings.SCRAPER_CACHE_DIR,
+                max_bytes=getattr(settings, 'SCRAPER_CACHE_MAX_BYTES', 200 * 1024 * 1024),
+            )
+        return _response_cache
@@ -0,0 +1,197 @@
+# core/services/dedupe.py
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import DuplicateCopy, HeadlineFingerprint, ScrapedData
+
+TOKEN = re.compile(r'\w+')
+
+# 64 hash functions in 16 bands of 4 rows: pairs with Jaccard similarity
+# 0.7 share a band ~98% of the time, pairs at 0.3 only ~12%
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Word-set Jaccard similarity at which two texts count as the same story
+THRESHOLD = 0.7
+
+# Very short texts share too many words by chance to be compared
+MIN_TOKENS = 4
+
+# Engagement added to the canonical item for every collapsed copy
+DUPLICATE_ENGAGEMENT = 1.0
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed: signatures are persisted and must be comparable across processes
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+
+
+def minhash(text):
+    """MinHash signature (NUM_PERM uint32 values) of the text's word set, or None if too short"""
+    tokens = set(TOKEN.findall(text.lower()))
+    if len(tokens) < MIN_TOKENS:
+        return None
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(t.encode('utf-8'), digest_size=4).digest(), 'little')
+         for t in tokens],
+        dtype=np.uint64,
+    )
+    with np.errstate(over='ignore'):
+        permuted = ((np.outer(hashes, _A) + _B) % _MERSENNE) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def normalize_link(link):
+    """Link with the host lowercased and fragment, tracking parameters and trailing slash dropped"""
+    parts = urlsplit(link.strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not k.startswith('utm_')])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), query, ''))
+
+
+def content_fingerprint(source, link, text):
+    """
+    Stable key of a scraped item: its source plus normalized link and text.
+    The same article or product scraped again gets the same fingerprint;
+    None if the item has neither link nor text to identify it.
+    """
+    link = normalize_link(link) if link else ''
+    text = ' '.join(text.lower().split()) if text else ''
+    if not link and not text:
+        return None
+    return hashlib.sha1(f"{source}\n{link}\n{text}".encode('utf-8')).hexdigest()
+
+
+def window_start():
+    return timezone.now() - timedelta(days=getattr(settings, 'DEDUPE_WINDOW_DAYS', 3))
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of the canonical items of one niche over a recent window.
+
+    Items whose signatures share a band are compared, and anything at or
+    above THRESHOLD is a copy of the earlier item: duplicate_of() counts it
+    against that canonical item instead of letting it be stored again.
+    save() persists fingerprints of new canonical items, remembers the
+    copies' content fingerprints (as DuplicateCopy rows) and applies the
+    duplicate counts (and engagement) to their rows. Records may be add()ed
+    before they are saved, as long as they are saved before the index is.
+    """
+
+    def __init__(self, niche, threshold=THRESHOLD):
+        self.niche = niche
+        self.threshold = threshold
+        self._buckets = defaultdict(list)  # (band, band bytes) -> canonical ids
+        self._signatures = {}  # canonical id -> signature
+        self._computed = {}  # text -> signature, for the add() following a miss
+        self._new = []
+        self._unsaved = {}  # negative placeholder id -> record added before it had a pk
+        self._copies = []  # (canonical id, content fingerprint) of copies found since the last save
+        self.duplicates = Counter()
+
+    @classmethod
+    def load(cls, niche, since=None, **kwargs):
+        """Index the niche's fingerprints stored since `since` (default: DEDUPE_WINDOW_DAYS ago)"""
+        index = cls(niche, **kwargs)
+        rows = HeadlineFingerprint.objects.filter(
+            niche=niche, created_at__gte=since or window_start()
+        ).values_list('scraped_data_id', 'signature')
+        for scraped_data_id, signature in rows:
+            index._insert(scraped_data_id, np.frombuffer(bytes(signature), dtype=np.uint32))
+        return index
+
+    def signature(self, text):
+        if text not in self._computed:
+            self._computed[text] = minhash(text)
+        return self._computed[text]
+
+    def find(self, text):
+        """Id of the canonical item the text duplicates (negative if not yet saved), or None"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        candidates = set()
+        for band, key in self._bands(signature):
+            candidates.update(self._buckets.get((band, key), ()))
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            score = similarity(signature, self._signatures[candidate])
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def duplicate_of(self, text, fingerprint=None):
+        """
+        Like find(), also counting the text as a copy of the item it matches.
+        The copy's content fingerprint, if given, is remembered on save.
+        """
+        canonical = self.find(text)
+        if canonical is not None:
+            self.duplicates[canonical] += 1
+            if fingerprint is not None:
+                self._copies.append((canonical, fingerprint))
+        return canonical
+
+    def add(self, text, record):
+        """Register a stored ScrapedData row as canonical for its text"""
+        signature = self.signature(text)
+        self._computed.pop(text, None)
+        if signature is None:
+            return
+        key = record.pk
+        if key is None:
+            key = -(len(self._unsaved) + 1)
+            self._unsaved[key] = record
+        self._insert(key, signature)
+        self._new.append(HeadlineFingerprint(
+            niche=self.niche, scraped_data=record, signature=signature.tobytes()
+        ))
+
+    def save(self):
+        HeadlineFingerprint.objects.bulk_create(self._new, ignore_conflicts=True)
+        self._new = []
+        DuplicateCopy.objects.bulk_create([
+            DuplicateCopy(niche=self.niche, canonical_id=self._pk(canonical), fingerprint=fingerprint)
+            for canonical, fingerprint in self._copies
+        ], ignore_conflicts=True)
+        self._copies = []
+        for canonical, copies in self.duplicates.items():
+            ScrapedData.objects.filter(pk=self._pk(canonical)).update(
+                duplicate_count=F('duplicate_count') + copies,
+                engagement_score=F('engagement_score') + copies * DUPLICATE_ENGAGEMENT,
+            )
+        self.duplicates.clear()
+
+    def _pk(self, key):
+        return self._unsaved[key].pk if key in self._unsaved else key
+
+    def _insert(self, key, signature):
+        self._signatures[key] = signature
+        for band in self._bands(signature):
+            self._buckets[band].append(key)
+
+    def _bands(self, signature):
+        return [(b, signature[b * ROWS:(b + 1) * ROWS].tobytes()) for b in range(BANDS)]
+
+
+def prune_fingerprints(before=None):
+    """Delete fingerprints (and remembered copies) older than the dedupe window; returns the number removed"""
+    before = before or window_start()
+    return (HeadlineFingerprint.objects.filter(created_at__lt=before).delete()[0]
+            + DuplicateCopy.objects.filter(created_at__lt=before).delete()[0])
@@ -0,0 +1,73 @@
+# core/services/feed_cache.py
+import feedparser
+import requests
+from django.utils import timezone
+
+from core.models import FeedCache
+
+HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+
+# Entry fields kept when caching; everything the scrapers read from an entry
+ENTRY_FIELDS = ('title', 'headline', 'link', 'published', 'summary', 'description')
+
+
+def fetch_feed(url, get=None):
+    """
+    Fetch a feed with a conditional GET.
+    Stored ETag / Last-Modified validators are sent with the request; on a
+    304 the entries parsed on the last full download are served from the
+    cache instead. `get(url, headers=...)` performs the request and returns a
+    response or None (scrapers pass their make_request so rate limits, retries
+    and circuit breakers apply). Returns a dict with 'entries' (plain dicts),
+    'bozo', 'not_modified' and 'status'.
+    """
+    cached = FeedCache.objects.filter(url=url).first()
+
+    headers = {}
+    if cached and cached.etag:
+        headers['If-None-Match'] = cached.etag
+    if cached and cached.modified:
+        headers['If-Modified-Since'] = cached.modified
+
+    response = (get or _get)(url, headers=headers)
+    if response is None:
+        return {'entries': [], 'bozo': True, 'not_modified': False, 'status': None}
+
+    if cached and response.status_code == 304:
+        cached.save(update_fields=['checked_at'])
+        return {'entries': cached.entries, 'bozo': False, 'not_modified': True, 'status': 304}
+
+    # feedparser looks headers up by lower-case name (charset / content-type sniffing)
+    response_headers = {k.lower(): v for k, v in response.headers.items()}
+    feed = feedparser.parse(response.content, response_headers=response_headers)
+    entries = [_entry_to_dict(e) for e in feed.get('entries', [])]
+
+    # Only a clean download is worth revalidating against later
+    if not feed.bozo and entries:
+        FeedCache.objects.update_or_create(
+            url=url,
+            defaults={
+                'etag': response.headers.get('ETag', ''),
+                'modified': response.headers.get('Last-Modified', ''),
+                'entries': entries,
+                'fetched_at': timezone.now(),
+            }
+        )
+
+    return {'entries': entries, 'bozo': bool(feed.bozo), 'not_modified': False,
+            'status': response.status_code}
+
+
+def _get(url, headers=None):
+    """Plain GET used when the caller has no scraper session"""
+    try:
+        r = requests.get(url, headers={**HEADERS, **(headers or {})}, timeout=10)
+        r.raise_for_status()
+        return r
+    except requests.RequestException:
+        return None
+
+
+def _entry_to_dict(entry):
+    """Reduce a FeedParserDict entry to the JSON-serializable fields we use"""
+    return {field: str(entry[field]) for field in ENTRY_FIELDS if entry.get(field)}
@@ -0,0 +1,105 @@
+# core/services/feed_registry.py
+import threading
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.models import FeedHealth
+
+# Exponential weighting for error rate / latency / change-cadence averages
+EWMA_ALPHA = 0.3
+
+# Feeds failing at least this often (after MIN_FETCHES) are skipped,
+# except for one retry every RETRY_FAILING_AFTER
+MAX_ERROR_RATE = 0.8
+MIN_FETCHES = 5
+RETRY_FAILING_AFTER = timedelta(hours=24)
+
+
+class FeedRegistry:
+    """
+    In-memory view of FeedHealth rows for a set of feeds.
+    Stats are recorded during a scrape (from worker threads) and written
+    back with a single save() at the end.
+    """
+
+    def __init__(self, records):
+        self._records = records
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, feed_urls):
+        urls = list(dict.fromkeys(feed_urls))
+        records = {r.url: r for r in FeedHealth.objects.filter(url__in=urls)}
+        for url in urls:
+            records.setdefault(url, FeedHealth(url=url))
+        return cls(records)
+
+    def get(self, feed_url):
+        with self._lock:
+            if feed_url not in self._records:
+                self._records[feed_url] = FeedHealth(url=feed_url)
+            return self._records[feed_url]
+
+    def order(self, feed_urls, niche):
+        """Deduplicated feeds for a niche, highest yield first, chronically failing feeds dropped"""
+        now = timezone.now()
+        ordered = []
+        for url in dict.fromkeys(feed_urls):
+            record = self.get(url)
+            failing = record.fetch_count >= MIN_FETCHES and record.error_rate >= MAX_ERROR_RATE
+            if failing and record.last_fetched_at and now - record.last_fetched_at < RETRY_FAILING_AFTER:
+                continue
+            ordered.append(record)
+        ordered.sort(key=lambda r: (-r.yield_for(niche), r.avg_latency))
+        return [r.url for r in ordered]
+
+    def record_fetch(self, feed_url, latency, ok, changed):
+        """Record one download: latency in seconds, success, and whether content changed"""
+        record = self.get(feed_url)
+        now = timezone.now()
+        with self._lock:
+            record.fetch_count += 1
+            if not ok:
+                record.error_count += 1
+            first = record.fetch_count == 1
+            # Recent failures dominate, so a recovered feed stops being skipped after a good fetch
+            record.error_rate = _ewma(None if first else record.error_rate, 0.0 if ok else 1.0)
+            record.avg_latency = _ewma(None if first else record.avg_latency, latency)
+            record.last_fetched_at = now
+            if ok and changed:
+                if record.last_changed_at:
+                    interval = (now - record.last_changed_at).total_seconds()
+                    record.change_interval = _ewma(record.change_interval, interval)
+                record.last_changed_at = now
+
+    def record_yield(self, feed_url, niche, relevant):
+        """Record how many relevant articles a feed gave a niche"""
+        record = self.get(feed_url)
+        with self._lock:
+            stats = record.niche_yields.setdefault(niche.lower(), {'fetches': 0, 'relevant': 0})
+            stats['fetches'] += 1
+            stats['relevant'] += relevant
+
+    def save(self):
+        with self._lock:
+            records = list(self._records.values())
+        new = [r for r in records if r.pk is None and r.fetch_count]
+        existing = [r for r in records if r.pk is not None]
+        if new:
+            # Another worker may have created the same feed; pick up the ids afterwards
+            FeedHealth.objects.bulk_create(new, ignore_conflicts=True)
+            ids = dict(FeedHealth.objects.filter(url__in=[r.url for r in new]).values_list('url', 'id'))
+            for record in new:
+                record.pk = ids.get(record.url)
+        if existing:
+            FeedHealth.objects.bulk_update(existing, [
+                'fetch_count', 'error_count', 'error_rate', 'avg_latency', 'last_fetched_at',
+                'last_changed_at', 'change_interval', 'niche_yields',
+            ])
+
+
+def _ewma(average, value):
+    if average is None:
+        return value
+    return EWMA_ALPHA * value + (1 - EWMA_ALPHA) * average
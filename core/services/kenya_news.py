@@ -1,10 +1,11 @@
 # core/services/kenya_news.py
 import requests
-from bs4 import BeautifulSoup
-import feedparser
 import time
 import random
 
+from core.scrapers.html_parsing import parsed
+from core.services.feed_cache import fetch_feed
+
 HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
 
 # A prioritized list of RSS feed URLs for Kenyan / regional news.
@@ -29,8 +30,7 @@ RSS_FEEDS = [
 def _parse_feed(url, limit=10):
     """Return list of titles from a feed URL, handling errors."""
     try:
-        d = feedparser.parse(url)
-        entries = d.get('entries', [])
+        entries = fetch_feed(url)['entries']
         titles = []
         for e in entries[:limit]:
             # try several fields for a clean headline
@@ -46,13 +46,13 @@ def _scrape_html_headlines(url, selectors, limit=10):
     try:
         r = requests.get(url, headers=HEADERS, timeout=10)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
         results = []
-        for sel in selectors:
-            for h in soup.select(sel)[:limit]:
-                txt = h.get_text(strip=True)
-                if txt:
-                    results.append(txt)
+        with parsed(r.content) as soup:
+            for sel in selectors:
+                for h in soup.select(sel)[:limit]:
+                    txt = h.get_text(strip=True)
+                    if txt:
+                        results.append(txt)
         return results[:limit]
     except Exception:
         return []
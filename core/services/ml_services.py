@@ -1,12 +1,119 @@
-import spacy
-from textblob import TextBlob
+import threading
 
-nlp = spacy.load('en_core_web_sm')
+from django.conf import settings
 
-def extract_keywords(text):
-    doc = nlp(text)
-    return list({chunk.text for chunk in doc.noun_chunks})[:5]
+from core.services.nlp_cache import NLPCache, package_version, text_hash
+from core.services.sentiment_engine import get_scorer
+
+# spaCy and the model are loaded on first use (or by warm_up()), so importing
+# this module (e.g. via core.tasks during Celery autodiscovery) stays cheap
+MODEL_NAME = 'en_core_web_sm'
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+# noun_chunks only needs the tagger, parser and attribute ruler; NER and the
+# lemmatizer would run for nothing
+UNUSED_PIPES = ['ner', 'lemmatizer']
+
+# Bump when the extraction / scoring logic changes, to invalidate cached results
+KEYWORDS_VERSION = 2
+SENTIMENT_VERSION = 1
+
+keyword_cache = NLPCache('keywords', lambda: (
+    f"{MODEL_NAME}=={package_version(MODEL_NAME)};spacy=={package_version('spacy')};v{KEYWORDS_VERSION}"
+))
+sentiment_cache = NLPCache('sentiment', lambda: (
+    f"textblob=={package_version('textblob')};{sentiment_backend()};v{SENTIMENT_VERSION}"
+))
+
+def get_nlp():
+    """The shared spaCy pipeline, loaded once per process on first call"""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(MODEL_NAME)
+    return _nlp
+
+def sentiment_backend():
+    return getattr(settings, 'SENTIMENT_BACKEND', 'textblob')
+
+def warm_up():
+    """Load the NLP models now instead of on the first analysed item"""
+    from textblob import TextBlob
+    nlp = get_nlp()
+    # Run both once so lazily built tables (vocab, sentiment lexicon) exist before any fork
+    nlp('Warm up the pipeline.')
+    TextBlob('Warm up the lexicon.').sentiment
+    if sentiment_backend() == 'lexicon':
+        get_scorer()
+
+def _disabled_pipes(nlp):
+    return [name for name in UNUSED_PIPES if name in nlp.pipe_names]
+
+def keyword_extractor():
+    return getattr(settings, 'KEYWORD_EXTRACTOR', 'spacy')
+
+def _keywords_from_doc(doc):
+    # Distinct noun chunks in order of appearance
+    return list(dict.fromkeys(chunk.text for chunk in doc.noun_chunks))[:5]
+
+def extract_keywords(text, niche=None):
+    return extract_keywords_batch([text], niche=niche)[0]
+
+def extract_keywords_batch(texts, batch_size=64, n_process=1, niche=None):
+    """
+    Keywords for many texts in input order. With KEYWORD_EXTRACTOR = 'tfidf'
+    they are scored against the niche's running corpus statistics (and the
+    batch is added to them), so results are not cached; otherwise cache
+    misses go through one nlp.pipe pass.
+    """
+    if keyword_extractor() == 'tfidf':
+        # Imported here: scikit-learn is only needed by this extractor
+        from core.services.tfidf_keywords import get_extractor
+        return get_extractor().extract(list(texts), niche=niche)
+    
+    def compute(missing):
+        nlp = get_nlp()
+        docs = nlp.pipe(missing, batch_size=batch_size, n_process=n_process,
+                        disable=_disabled_pipes(nlp))
+        return [_keywords_from_doc(doc) for doc in docs]
+    return _cached_batch(keyword_cache, texts, compute)
 
 def analyze_sentiment(text):
-    blob = TextBlob(text)
-    return (blob.sentiment.polarity + 1) / 2
+    return analyze_sentiment_batch([text])[0]
+
+def analyze_sentiment_batch(texts):
+    """Sentiment in [0, 1] for many texts in input order, computing only cache misses"""
+    def compute(missing):
+        if sentiment_backend() == 'lexicon':
+            return get_scorer().score_batch(missing)
+        from textblob import TextBlob
+        return [(TextBlob(text).sentiment.polarity + 1) / 2 for text in missing]
+    return _cached_batch(sentiment_cache, texts, compute)
+
+def _cached_batch(cache, texts, compute):
+    """Serve texts from the cache, computing each distinct miss once"""
+    results = cache.get_many(texts)
+    pending = {}
+    for i, value in enumerate(results):
+        if value is None:
+            pending.setdefault(text_hash(texts[i]), []).append(i)
+    if pending:
+        missing = [texts[indexes[0]] for indexes in pending.values()]
+        computed = compute(missing)
+        cache.set_many(missing, computed)
+        for indexes, value in zip(pending.values(), computed):
+            for i in indexes:
+                results[i] = value
+    return results
+
+def cache_stats():
+    """Hit / miss counters of the keyword and sentiment caches"""
+    return {'keywords': keyword_cache.stats(), 'sentiment': sentiment_cache.stats()}
+
+def purge_caches(before=None):
+    """Delete persisted entries of old model versions (and created before `before`); returns {kind: rows deleted}"""
+    return {'keywords': keyword_cache.purge_stale(before), 'sentiment': sentiment_cache.purge_stale(before)}
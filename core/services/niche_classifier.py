@@ -0,0 +1,103 @@
+# core/services/niche_classifier.py
+import re
+
+import numpy as np
+from scipy import sparse
+
+from core.scrapers.keyword_matcher import matcher_for, resolve_niche_keywords
+
+TOKEN = re.compile(r'\w+')
+
+# Same bar as NewsScraper.is_highly_relevant: at least two keyword matches
+MIN_MATCHES = 2
+
+
+def niche_keywords_from(mappings, niches):
+    """
+    Keywords per requested niche, merged from several niche -> keywords maps
+    (e.g. NewsScraper.niche_keywords and MarketplaceScraper.niche_categories),
+    each resolved the way the scrapers resolve a niche name. A keyword listed
+    twice in one map keeps both entries, as KeywordMatcher counts them;
+    keywords already taken from an earlier map are not added again.
+    """
+    merged = {}
+    for niche in niches:
+        keywords = []
+        for mapping in mappings:
+            known = set(keywords)
+            keywords.extend(k for k in resolve_niche_keywords(mapping, niche) if k not in known)
+        merged[niche] = keywords
+    return merged
+
+
+class NicheClassifier:
+    """
+    Scores texts against every niche at once.
+
+    Keywords become word n-grams in one vocabulary and a sparse term x niche
+    matrix. Each text is tokenized once, its n-grams looked up to form a
+    sparse text x term indicator row, and a single sparse product counts the
+    keyword entries of every niche whose words occur in every text. A
+    whole-word keyword match always shows up there, so the pairs below
+    min_matches can be dropped; the few that pass are scored by the niche's
+    KeywordMatcher, the same rule (and relevance) as NewsScraper.match_niche.
+    """
+
+    def __init__(self, niche_keywords, min_matches=MIN_MATCHES):
+        self.niches = list(niche_keywords)
+        self.min_matches = min_matches
+        self.matchers = [matcher_for(niche_keywords[niche]) for niche in self.niches]
+        self.vocabulary = {}
+        rows, cols = [], []
+        for col, niche in enumerate(self.niches):
+            for keyword in niche_keywords[niche]:
+                term = ' '.join(TOKEN.findall(keyword.lower()))
+                if not term:
+                    continue
+                rows.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                cols.append(col)
+        self.max_ngram = max((t.count(' ') + 1 for t in self.vocabulary), default=1)
+        # A keyword listed twice for a niche counts twice, as in KeywordMatcher
+        self.weights = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(self.vocabulary), len(self.niches))
+        )
+
+    @classmethod
+    def from_mappings(cls, mappings, niches, **kwargs):
+        return cls(niche_keywords_from(mappings, niches), **kwargs)
+
+    def terms(self, text):
+        """Distinct vocabulary ids of the text's word n-grams"""
+        tokens = TOKEN.findall(text.lower())
+        found = set()
+        for n in range(1, self.max_ngram + 1):
+            for i in range(len(tokens) - n + 1):
+                term = self.vocabulary.get(' '.join(tokens[i:i + n]))
+                if term is not None:
+                    found.add(term)
+        return found
+
+    def match_counts(self, texts):
+        """Dense texts x niches array of keyword entries whose words occur in each text"""
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            found = self.terms(text)
+            rows.extend([row] * len(found))
+            cols.extend(found)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(texts), len(self.vocabulary))
+        )
+        return (matrix @ self.weights).toarray()
+
+    def classify(self, texts):
+        """For each text, the (niche, relevance 0-100) pairs that pass the match threshold"""
+        counts = self.match_counts(texts)
+        results = [[] for _ in texts]
+        lowered = {}
+        for row, col in zip(*np.nonzero(counts >= self.min_matches)):
+            if row not in lowered:
+                lowered[row] = texts[row].lower()
+            matches, relevance = self.matchers[col].match(lowered[row])
+            if matches >= self.min_matches:
+                results[row].append((self.niches[col], relevance))
+        return results
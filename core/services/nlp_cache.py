@@ -0,0 +1,137 @@
+# core/services/nlp_cache.py
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from importlib import metadata
+
+from django.db.models import Q
+
+from core.models import NLPCacheEntry
+
+# SQLite caps bound parameters per query; stay well below it
+LOOKUP_CHUNK = 500
+
+
+def normalize(text):
+    """Collapse whitespace so trivially different copies of a headline share a key"""
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def text_hash(text):
+    return hashlib.sha1(normalize(text).encode('utf-8')).hexdigest()
+
+
+def package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+class NLPCache:
+    """
+    Two-tier memo cache for one kind of NLP result: an in-process LRU in
+    front of the NLPCacheEntry table. Entries are keyed by a hash of the
+    normalized text and scoped to a version string (model name + version),
+    so upgrading a model simply stops matching the old rows.
+    """
+
+    def __init__(self, kind, version, maxsize=10000):
+        self.kind = kind
+        self._version = version  # String, or a callable evaluated on first use
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    @property
+    def version(self):
+        if callable(self._version):
+            self._version = self._version()
+        return self._version
+
+    def get_many(self, texts):
+        """Cached values in input order, with None for misses"""
+        hashes = [text_hash(t) for t in texts]
+        results = [None] * len(texts)
+        missing = {}
+
+        with self._lock:
+            for i, h in enumerate(hashes):
+                if h in self._memory:
+                    self._memory.move_to_end(h)
+                    results[i] = self._memory[h]
+                    self.memory_hits += 1
+                else:
+                    missing.setdefault(h, []).append(i)
+
+        found = {}
+        keys = list(missing)
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            rows = NLPCacheEntry.objects.filter(
+                kind=self.kind, version=self.version, text_hash__in=keys[start:start + LOOKUP_CHUNK]
+            ).values_list('text_hash', 'value')
+            found.update(rows)
+
+        with self._lock:
+            for h, indexes in missing.items():
+                if h in found:
+                    for i in indexes:
+                        results[i] = found[h]
+                    self.db_hits += len(indexes)
+                    self._remember(h, found[h])
+                else:
+                    self.misses += len(indexes)
+        return results
+
+    def set_many(self, texts, values):
+        """Store freshly computed values in both tiers"""
+        entries = {}
+        with self._lock:
+            for text, value in zip(texts, values):
+                h = text_hash(text)
+                self._remember(h, value)
+                entries[h] = value
+        NLPCacheEntry.objects.bulk_create(
+            [NLPCacheEntry(kind=self.kind, version=self.version, text_hash=h, value=v)
+             for h, v in entries.items()],
+            ignore_conflicts=True,
+        )
+
+    def get(self, text):
+        return self.get_many([text])[0]
+
+    def set(self, text, value):
+        self.set_many([text], [value])
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            'kind': self.kind,
+            'version': self.version,
+            'memory_hits': self.memory_hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.db_hits) / lookups if lookups else 0.0,
+            'memory_size': len(self._memory),
+        }
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def purge_stale(self, before=None):
+        """Delete persisted entries left behind by older model versions, and any created before `before`"""
+        stale = ~Q(version=self.version)
+        if before is not None:
+            stale |= Q(created_at__lt=before)
+        return NLPCacheEntry.objects.filter(stale, kind=self.kind).delete()[0]
@@ -0,0 +1,167 @@
+# core/services/retention.py
+import gzip
+import json
+import os
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.db import write
+from core.models import DataSource, ScrapedData
+
+# Rows exported, deleted or compacted per statement / transaction
+CHUNK_SIZE = 1000
+
+ARCHIVE_SUFFIX = '.jsonl.gz'
+
+
+def retention_days(source):
+    """
+    Days a DataSource's items are kept: its config['retention_days'], else
+    RETENTION_DAYS for its name, else RETENTION_DAYS['default']. None keeps
+    them forever.
+    """
+    if 'retention_days' in source.config:
+        return source.config['retention_days']
+    policies = getattr(settings, 'RETENTION_DAYS', {})
+    return policies.get(source.name, policies.get('default'))
+
+
+def archive_root(root=None):
+    return Path(root or getattr(settings, 'ARCHIVE_DIR', settings.BASE_DIR / 'archive'))
+
+
+def partition_path(source_name, day, root=None):
+    """Archive file holding a source's items scraped on a day"""
+    return archive_root(root) / source_name / f"{day.isoformat()}{ARCHIVE_SUFFIX}"
+
+
+def serialize(record):
+    """Archived form of a ScrapedData row (one JSONL line)"""
+    return {
+        'id': record.pk,
+        'niche': record.niche.name,
+        'niche_id': record.niche_id,
+        'source': record.source.name,
+        'raw_data': record.raw_data,
+        'cleaned_data': record.cleaned_data,
+        'keywords': record.keywords,
+        'sentiment': record.sentiment,
+        'engagement_score': record.engagement_score,
+        'duplicate_count': record.duplicate_count,
+        'fingerprint': record.fingerprint,
+        'created_at': record.created_at.isoformat(),
+    }
+
+
+def archive_expired(now=None, root=None, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Export items past their source's retention to the archive, then delete
+    them, a chunk at a time: a chunk is only deleted once its archive files
+    are synced to disk. An interrupted run can leave the last chunk archived
+    but not deleted, so archives may hold a row twice (same 'id').
+    Returns {source name: rows archived} (rows that would be, with dry_run).
+    """
+    now = now or timezone.now()
+    archived = Counter()
+    for source in DataSource.objects.order_by('pk'):
+        days = retention_days(source)
+        if days is None:
+            continue
+        archived.setdefault(source.name, 0)
+        expired = ScrapedData.objects.filter(source=source, created_at__lt=now - timedelta(days=days))
+        if dry_run:
+            archived[source.name] += expired.count()
+            continue
+        while True:
+            chunk = list(expired.select_related('niche', 'source').order_by('pk')[:chunk_size])
+            if not chunk:
+                break
+            _export(chunk, root)
+            write(_delete, [record.pk for record in chunk])
+            archived[source.name] += len(chunk)
+    return dict(archived)
+
+
+def compact_cleaned_data(now=None, chunk_size=CHUNK_SIZE):
+    """
+    Drop cleaned_data (set it NULL) on items older than COMPACT_AFTER_DAYS
+    where it is just clean_data(raw_data) and can be derived again.
+    Returns the number of rows compacted.
+    """
+    from core.tasks import clean_data
+
+    days = getattr(settings, 'COMPACT_AFTER_DAYS', 7)
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    old = ScrapedData.objects.filter(created_at__lt=cutoff, cleaned_data__isnull=False).order_by('pk')
+    compacted, last_pk = 0, 0
+    while True:
+        rows = list(old.filter(pk__gt=last_pk).values_list('pk', 'raw_data', 'cleaned_data')[:chunk_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        derivable = [pk for pk, raw_data, cleaned_data in rows if cleaned_data == clean_data(raw_data)]
+        if derivable:
+            compacted += write(_clear_cleaned_data, derivable)
+    return compacted
+
+
+def purge_nlp_cache(now=None):
+    """
+    Delete NLP cache entries of old model versions or older than
+    NLP_CACHE_DAYS (None: only old versions). Returns {kind: rows deleted}.
+    """
+    from core.services.ml_services import purge_caches
+
+    days = getattr(settings, 'NLP_CACHE_DAYS', 30)
+    before = None if days is None else (now or timezone.now()) - timedelta(days=days)
+    return write(purge_caches, before)
+
+
+def archive_partitions(source=None, start=None, end=None, root=None):
+    """Archive files for a source (default: all), oldest day first, optionally within [start, end]"""
+    base = archive_root(root)
+    directories = [base / source] if source else sorted(p for p in base.glob('*') if p.is_dir())
+    partitions = []
+    for directory in directories:
+        for path in directory.glob(f"*{ARCHIVE_SUFFIX}"):
+            day = date.fromisoformat(path.name[:-len(ARCHIVE_SUFFIX)])
+            if (start is None or day >= start) and (end is None or day <= end):
+                partitions.append((day, directory.name, path))
+    return [path for _, _, path in sorted(partitions)]
+
+
+def read_archive(source=None, start=None, end=None, root=None):
+    """Stream archived items (as serialize() wrote them) back, one partition at a time"""
+    for path in archive_partitions(source, start, end, root):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def _export(records, root):
+    by_partition = defaultdict(list)
+    for record in records:
+        day = timezone.localtime(record.created_at).date()
+        by_partition[partition_path(record.source.name, day, root)].append(record)
+
+    for path, partition in by_partition.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Each export appends a gzip member; readers see one continuous stream
+        with open(path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='ab') as f:
+                for record in partition:
+                    f.write(json.dumps(serialize(record), ensure_ascii=False).encode('utf-8') + b'\n')
+            raw.flush()
+            os.fsync(raw.fileno())
+
+
+def _delete(pks):
+    return ScrapedData.objects.filter(pk__in=pks).delete()[0]
+
+
+def _clear_cleaned_data(pks):
+    return ScrapedData.objects.filter(pk__in=pks).update(cleaned_data=None)
@@ -0,0 +1,163 @@
+# core/services/sentiment_engine.py
+import re
+import threading
+
+import numpy as np
+
+# Same tokens TextBlob's pattern tokenizer produces for the parts that matter
+# to the lexicon: quotes and apostrophes split off ("it's" -> "it ' s"),
+# leading / trailing punctuation split into single characters, inner hyphens
+# and periods kept ("e-commerce", "u.s"). "n't" is split off first, as
+# pattern does ("isn't" -> "is n ' t").
+TOKEN = re.compile(r"\.\.\.|\w(?:[^\s'\"“”‘’]*\w)?|[^\w\s]")
+
+# Marks document boundaries in the joined batch; it tokenizes as one character
+DOC_BREAK = '\x00'
+
+NEGATIONS = ('no', 'not', 'never')
+EXCLAMATION_BOOST = 1.25
+NEGATION_FACTOR = -0.5
+
+
+class LexiconScorer:
+    """
+    Batch re-implementation of TextBlob's PatternAnalyzer polarity.
+
+    A whole batch is tokenized with one regex pass and scored with array
+    operations over the flat token stream, applying the same rules as
+    pattern's Sentiment.assessments(): adverbs modify the next known word
+    ("very good"), negations flip and halve it ("not good"), and "!" boosts
+    the preceding assessment. Emoticons and the "(!)" irony mark are not
+    scored, so results can differ slightly from TextBlob on such texts.
+    """
+
+    def __init__(self, lexicon=None):
+        if lexicon is None:
+            lexicon = _textblob_lexicon()
+        # word -> (polarity, intensity, is_modifier)
+        words = sorted(lexicon)
+        self.vocabulary = {w: i for i, w in enumerate(words)}
+        # One extra zero row for unknown tokens (index -1)
+        self.polarity = np.zeros(len(words) + 1)
+        self.intensity = np.ones(len(words) + 1)
+        self.modifier = np.zeros(len(words) + 1, dtype=bool)
+        for i, w in enumerate(words):
+            self.polarity[i], self.intensity[i], self.modifier[i] = lexicon[w]
+        self.ly_modifier = np.array([w.endswith('ly') for w in words] + [False])
+
+    def tokenize(self, texts):
+        """Lowercased tokens of the whole batch, and the document index of each token"""
+        joined = f' {DOC_BREAK} '.join(t.replace(DOC_BREAK, ' ') for t in texts)
+        joined = joined.replace("n't", " n't").lower()
+        tokens = TOKEN.findall(joined)
+        breaks = np.fromiter((t == DOC_BREAK for t in tokens), dtype=bool, count=len(tokens))
+        return tokens, breaks, np.cumsum(breaks)
+
+    def polarity_batch(self, texts):
+        """Polarity in [-1, 1] for each text, as TextBlob(text).sentiment.polarity"""
+        texts = list(texts)
+        if not texts:
+            return np.zeros(0)
+        tokens, breaks, doc = self.tokenize(texts)
+        n = len(tokens)
+        if not n:
+            return np.zeros(len(texts))
+        idx = np.arange(n)
+
+        ids = np.fromiter((self.vocabulary.get(t, -1) for t in tokens), dtype=np.int64, count=n)
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=n)
+        known = ids >= 0
+        negation = np.fromiter((t in NEGATIONS for t in tokens), dtype=bool, count=n)
+        bang = np.fromiter((t == '!' for t in tokens), dtype=bool, count=n)
+        is_modifier = self.modifier[ids] & known
+
+        # A modifier stays active across short unknown words ("really is a good");
+        # known words and longer unknown words end it. Negations right after an
+        # -ly adverb attach to it ("really not good") without ending it.
+        m_events = known | ((lengths > 2) & ~negation) | breaks
+        m_source = _last_before(m_events, idx)
+        m_active = (m_source >= 0) & is_modifier[m_source]
+        absorbed = negation & m_active & self.ly_modifier[ids[m_source]]
+
+        m_events |= negation & (lengths > 2) & ~absorbed
+        m_source = _last_before(m_events, idx)
+        m_active = (m_source >= 0) & is_modifier[m_source]
+
+        # A negation stays pending across one-character tokens ("not a good")
+        n_events = known | negation | (lengths > 1) | breaks
+        n_source = _last_before(n_events, idx)
+        pending = (n_source >= 0) & negation[n_source] & ~absorbed[n_source]
+
+        # Known words following an active modifier merge into its assessment
+        merged = known & m_active
+        head = np.maximum.accumulate(np.where(known & ~merged, idx, -1))
+        previous_known = _last_before(known, idx)
+
+        intensity = np.where(pending, 1.0 / self.intensity[ids], self.intensity[ids])
+        value = self.polarity[ids].copy()
+        prev = previous_known[merged]
+        value[merged] = np.clip(value[merged] * intensity[prev], -1.0, 1.0)
+
+        negated = np.zeros(n)
+        negated[known] = pending[known]
+        absorbed_into = previous_known[absorbed]
+        np.add.at(negated, absorbed_into[absorbed_into >= 0], 1)
+
+        # Each assessment is a run of merged known words; its score is that of the last one
+        known_idx = idx[known]
+        heads = head[known_idx]
+        last = np.ones(len(known_idx), dtype=bool)
+        last[:-1] = heads[:-1] != heads[1:]
+        entries = known_idx[last]
+        entry_negated = np.bincount(heads, weights=negated[known_idx], minlength=n)[heads[last]] > 0
+
+        # "!" boosts the assessment before it, unless a later word merges into it
+        targets = previous_known[bang]
+        targets = targets[(targets >= 0) & (doc[np.maximum(targets, 0)] == doc[bang])]
+        boosts = np.bincount(targets, minlength=n)[entries]
+        scores = np.clip(value[entries] * EXCLAMATION_BOOST ** boosts, -1.0, 1.0)
+        scores = np.where(entry_negated, scores * NEGATION_FACTOR, scores)
+
+        entry_doc = doc[entries]
+        totals = np.bincount(entry_doc, weights=scores, minlength=len(texts))
+        counts = np.bincount(entry_doc, minlength=len(texts))
+        return totals / np.maximum(counts, 1)
+
+    def score_batch(self, texts):
+        """Sentiment on the (polarity + 1) / 2 scale used across the app"""
+        return ((self.polarity_batch(texts) + 1) / 2).tolist()
+
+
+def _last_before(mask, idx):
+    """Index of the last position before each token where mask is set, or -1"""
+    last = np.maximum.accumulate(np.where(mask, idx, -1))
+    return np.concatenate(([-1], last[:-1]))
+
+
+def _textblob_lexicon():
+    """Single-word entries of TextBlob's en-sentiment.xml lexicon, as TextBlob averages them"""
+    from textblob.en import sentiment
+
+    if not dict.__len__(sentiment):
+        sentiment.load()
+    lexicon = {}
+    for word, senses in dict.items(sentiment):
+        if ' ' in word:
+            continue  # Multi-word entries never match single tokens
+        polarity, _, intensity = senses[None]
+        lexicon[word] = (polarity, intensity, 'RB' in senses)
+    return lexicon
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_scorer():
+    """The shared LexiconScorer, built once per process on first call"""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = LexiconScorer()
+    return _scorer
@@ -0,0 +1,122 @@
+# core/services/tfidf_keywords.py
+import threading
+import zlib
+
+import numpy as np
+from django.db import transaction
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer
+from sklearn.utils import murmurhash3_32
+
+from core.models import NicheTermStats
+
+N_FEATURES = 2 ** 18
+NGRAM_RANGE = (1, 2)
+TOP_K = 5
+
+# scikit-learn's list has a few words that carry meaning in headlines ("finance bill")
+STOP_WORDS = sorted(ENGLISH_STOP_WORDS - {'bill', 'interest', 'fire', 'system', 'computer', 'mill'})
+
+
+def _pre_analyzed(terms):
+    return terms
+
+
+class TfidfKeywordExtractor:
+    """
+    Keywords as the highest TF-IDF n-grams of each text, against running
+    document frequencies kept per niche.
+
+    Terms are hashed into a fixed-size feature space (no vocabulary to grow
+    or store), so a niche's corpus statistics are one document-frequency
+    array and a document count. Each batch is folded into the statistics
+    and then scored with a single sparse product.
+    """
+
+    def __init__(self, n_features=N_FEATURES, ngram_range=NGRAM_RANGE, top_k=TOP_K):
+        self.n_features = n_features
+        self.top_k = top_k
+        self.analyzer = HashingVectorizer(ngram_range=ngram_range, stop_words=STOP_WORDS).build_analyzer()
+        self.hasher = HashingVectorizer(
+            analyzer=_pre_analyzed, n_features=n_features, alternate_sign=False, norm=None
+        )
+
+    def feature(self, term):
+        """Column a term hashes to (the same as HashingVectorizer's)"""
+        return abs(murmurhash3_32(term, seed=0)) % self.n_features
+
+    def extract(self, texts, niche=None, update=True):
+        """Top keywords per text in input order; the batch is added to the niche's statistics"""
+        if not texts:
+            return []
+        analyzed = [self.analyzer(text) for text in texts]
+        counts = self.hasher.transform(analyzed).tocsr()
+        present = np.bincount(counts.indices, minlength=self.n_features)
+
+        with transaction.atomic():
+            stats = self._load(niche)
+            n_docs = stats.n_docs + len(texts)
+            doc_freq = _unpack(stats.doc_freq, self.n_features) + present
+            if update:
+                stats.n_docs = n_docs
+                stats.doc_freq = _pack(doc_freq)
+                stats.save()
+
+        # Smoothed idf, as TfidfTransformer(smooth_idf=True) computes it
+        idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+        scores = counts.multiply(idf).tocsr()
+        return [self._top_terms(terms, scores, row) for row, terms in enumerate(analyzed)]
+
+    def _top_terms(self, terms, scores, row):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        columns, values = scores.indices[start:end], scores.data[start:end]
+        # First term of the text hashing to each column (collisions are rare)
+        names = {}
+        for term in terms:
+            names.setdefault(self.feature(term), term)
+
+        keywords, covered = [], set()
+        for i in np.argsort(-values, kind='stable'):
+            term = names.get(columns[i])
+            words = set(term.split()) if term else None
+            # Skip terms adding no new word ("profit" after "record profit")
+            if not words or words <= covered:
+                continue
+            keywords.append(term)
+            covered |= words
+            if len(keywords) == self.top_k:
+                break
+        return keywords
+
+    def _load(self, niche):
+        stats = NicheTermStats.objects.select_for_update().filter(niche=niche).first()
+        if stats is None or stats.n_features != self.n_features:
+            # New niche, or the feature space changed: start over
+            stats = stats or NicheTermStats(niche=niche)
+            stats.n_features = self.n_features
+            stats.n_docs = 0
+            stats.doc_freq = b''
+        return stats
+
+
+def _pack(doc_freq):
+    return zlib.compress(doc_freq.astype(np.int32).tobytes())
+
+
+def _unpack(data, n_features):
+    if not data:
+        return np.zeros(n_features, dtype=np.int64)
+    return np.frombuffer(zlib.decompress(bytes(data)), dtype=np.int32).astype(np.int64)
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_extractor():
+    """The shared TfidfKeywordExtractor, built once per process on first call"""
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = TfidfKeywordExtractor()
+    return _extractor
@@ -0,0 +1,159 @@
+# core/services/trend_clustering.py
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, FloatField, Value, When
+from django.utils import timezone
+
+from core.models import AdKeyword, Trend
+
+TOKEN = re.compile(r'\w+')
+
+# Words that make keyword phrases look alike without saying anything
+STOP_WORDS = {
+    'a', 'an', 'and', 'as', 'at', 'by', 'for', 'from', 'in', 'is', 'it', 'its', 'new',
+    'of', 'on', 'or', 'our', 'the', 'their', 'this', 'to', 'with', 'your',
+}
+
+# Word-set Jaccard similarity needed to join a cluster
+THRESHOLD = 0.25
+
+# Keywords kept on a trend (the first ones also become its AdKeywords)
+MAX_KEYWORDS = 8
+AD_KEYWORDS = 5
+
+
+def keyword_terms(keywords):
+    """Content words of a keyword list, lowercased"""
+    return {
+        word for keyword in keywords for word in TOKEN.findall(keyword.lower())
+        if word not in STOP_WORDS
+    }
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class TrendClusterer:
+    """
+    Assigns scraped items to the open trends of one niche.
+
+    An item joins the open trend whose keywords are most similar to its own
+    (word-set Jaccard, at least THRESHOLD). The trend's sentiment and score
+    become running means over its items and new keywords are appended, so a
+    story covered by many items is one Trend row instead of one per item.
+    Trends not updated within TREND_WINDOW_HOURS are closed.
+
+    Nothing is written until save(): new trends and their AdKeywords are
+    inserted with bulk_create, updated trends with bulk_update, so a batch
+    costs a handful of statements however many items it has.
+    """
+
+    def __init__(self, niche, window=None, threshold=THRESHOLD):
+        self.niche = niche
+        self.threshold = threshold
+        hours = getattr(settings, 'TREND_WINDOW_HOURS', 48)
+        self.window = window or timedelta(hours=hours)
+        self.trends = []
+        self._terms = []  # keyword terms, parallel to self.trends
+        self._changed = set()  # indexes of saved trends updated since the last save()
+        self._ad_keywords = []  # unsaved AdKeywords, their trends possibly unsaved too
+        self.created = 0
+        self.merged = 0
+
+    @classmethod
+    def load(cls, niche, **kwargs):
+        """Close the niche's stale trends and load the ones still open"""
+        clusterer = cls(niche, **kwargs)
+        cutoff = timezone.now() - clusterer.window
+        Trend.objects.filter(niche=niche, is_open=True, updated_at__lt=cutoff).update(is_open=False)
+        for trend in Trend.objects.filter(niche=niche, is_open=True):
+            clusterer._track(trend)
+        return clusterer
+
+    def assign(self, keywords, sentiment, score, source):
+        """Add an item to its best matching open trend, or start a new one; returns the (unsaved) trend"""
+        terms = keyword_terms(keywords)
+        best, best_similarity = None, self.threshold
+        for i, trend_terms in enumerate(self._terms):
+            similarity = jaccard(terms, trend_terms)
+            if similarity >= best_similarity:
+                best, best_similarity = i, similarity
+
+        if best is None:
+            return self._create(keywords, sentiment, score, source)
+
+        trend = self.trends[best]
+        n = trend.item_count + 1
+        trend.sentiment += (sentiment - trend.sentiment) / n
+        trend.score += (score - trend.score) / n
+        trend.item_count = n
+        if trend.source != source:
+            trend.source = 'multiple'
+        new_keywords = [k for k in keywords if k not in trend.keywords]
+        added = new_keywords[:max(MAX_KEYWORDS - len(trend.keywords), 0)]
+        if added:
+            self._add_ad_keywords(trend, added, start=len(trend.keywords))
+            trend.keywords = trend.keywords + added
+            self._terms[best] = keyword_terms(trend.keywords)
+        if trend.pk is not None:
+            self._changed.add(best)
+        self.merged += 1
+        return trend
+
+    def save(self):
+        """Write the new and updated trends and their AdKeywords, in one transaction"""
+        batch_size = getattr(settings, 'INGEST_BATCH_SIZE', 500)
+        new = [trend for trend in self.trends if trend.pk is None]
+        changed = [self.trends[i] for i in sorted(self._changed)]
+        now = timezone.now()
+        for trend in changed:
+            # bulk_update() skips auto_now
+            trend.updated_at = now
+
+        with transaction.atomic():
+            Trend.objects.bulk_create(new, batch_size=batch_size)
+            Trend.objects.bulk_update(
+                changed, ['keywords', 'sentiment', 'score', 'source', 'item_count', 'updated_at'],
+                batch_size=batch_size,
+            )
+            # AdKeywords take their trend's final figures; the trends now have pks to link to
+            for ad_keyword in self._ad_keywords:
+                ad_keyword.performance_score = ad_keyword.trend.sentiment * ad_keyword.trend.score
+            AdKeyword.objects.bulk_create(self._ad_keywords, batch_size=batch_size)
+            for start in range(0, len(changed), batch_size):
+                chunk = changed[start:start + batch_size]
+                AdKeyword.objects.filter(trend__in=chunk).update(performance_score=Case(
+                    *[When(trend_id=trend.pk, then=Value(trend.sentiment * trend.score)) for trend in chunk],
+                    output_field=FloatField(),
+                ))
+
+        self._changed = set()
+        self._ad_keywords = []
+
+    def _create(self, keywords, sentiment, score, source):
+        trend = Trend(
+            niche=self.niche,
+            keywords=list(keywords[:MAX_KEYWORDS]),
+            sentiment=sentiment,
+            score=score,
+            source=source,
+        )
+        self._add_ad_keywords(trend, trend.keywords, start=0)
+        self._track(trend)
+        self.created += 1
+        return trend
+
+    def _add_ad_keywords(self, trend, keywords, start):
+        # Only the trend's first AD_KEYWORDS keywords are advertised
+        self._ad_keywords.extend(
+            AdKeyword(trend=trend, keyword=keyword, source=trend.source)
+            for keyword in keywords[:max(AD_KEYWORDS - start, 0)]
+        )
+
+    def _track(self, trend):
+        self.trends.append(trend)
+        self._terms.append(keyword_terms(trend.keywords))
@@ -1,58 +1,246 @@
 # core/tasks.py
 from celery import shared_task
-from .models import Niche, ScrapedData, Trend, AdKeyword, DataSource
+from django.conf import settings
+from .db import write
+from .models import Niche, ScrapedData, DataSource, DuplicateCopy
 from .scrapers.master_scraper import MasterScraper
-from .services.ml_services import extract_keywords, analyze_sentiment
+from .services.ml_services import extract_keywords_batch, analyze_sentiment_batch, cache_stats
+from .services.dedupe import NearDuplicateIndex, content_fingerprint, prune_fingerprints
+from .services.retention import archive_expired, compact_cleaned_data, purge_nlp_cache
+from .services.trend_clustering import TrendClusterer
 from datetime import datetime
 import json
 
+# Headline sources ('news', 'news_direct') are deduplicated; products are not
+DEDUPE_SOURCE_PREFIX = 'news'
+
 @shared_task
 def run_multi_source_scraping():
-    """Run scraping from all sources for all niches"""
-    niches = Niche.objects.all()
+    """
+    Scrape all sources for all niches and store the raw items.
+    Analysis (NLP, trend clustering) is handed to analyze_scraped_data on the
+    analysis queue in batches of ids, unless ANALYSIS_INLINE is set.
+    """
+    niches = list(Niche.objects.all())
     master_scraper = MasterScraper()
+    inline = getattr(settings, 'ANALYSIS_INLINE', False)
+    sources = load_data_sources()
+    
+    print(f"Starting multi-source scraping for {len(niches)} niches")
+    
+    # Feeds are fetched once per run and shared by every niche
+    master_scraper.start_run()
+    prune_fingerprints()
     
-    print(f"Starting multi-source scraping for {niches.count()} niches")
+    # News is classified for all niches in one pass over the feeds
+    news = master_scraper.prefetch_news([niche.name for niche in niches])
     
     for niche in niches:
         try:
             print(f"\n🔍 Processing niche: {niche.name}")
             
             # Scrape all sources
-            scraped_data = master_scraper.scrape_all_sources(niche.name)
+            prefetched = {'news': news[niche.name]} if niche.name in news else None
+            scraped_data = master_scraper.scrape_all_sources(niche.name, prefetched=prefetched)
+            index = NearDuplicateIndex.load(niche)
+            records, repeats, duplicates = build_scraped_records(niche, scraped_data, sources, index)
             
-            # Save raw data
-            for data_item in scraped_data:
-                scraped_record = ScrapedData.objects.create(
-                    niche=niche,
-                    source=DataSource.objects.get_or_create(
-                        name=data_item.get('source', 'unknown'),
-                        defaults={'is_active': True}
-                    )[0],
-                    raw_data=data_item,
-                    cleaned_data=clean_data(data_item)
-                )
-                
-                # Extract keywords and sentiment
-                text = extract_text_from_data(data_item)
-                if text:
-                    keywords = extract_keywords(text)
-                    sentiment = analyze_sentiment(text)
-                    
-                    scraped_record.keywords = keywords
-                    scraped_record.sentiment = sentiment
-                    scraped_record.save()
-                    
-                    # Create trend if significant
-                    if len(keywords) > 0 and sentiment > 0.1:
-                        create_trend_from_scraped_data(niche, keywords, sentiment, data_item)
+            # Inline, NLP runs before the insert so each row is written once
+            analysed = annotate_records(niche, records) if inline else []
+            save_scraped_records(records, index, repeats)
+            print(f"💾 {niche.name}: stored {len(records)} items, refreshed {len(repeats)} already stored "
+                  f"({duplicates} near-duplicates collapsed)")
             
-            print(f"✅ Completed {niche.name}: {len(scraped_data)} items")
+            if inline:
+                cluster_records(niche, analysed)
+            else:
+                batch_size = settings.ANALYSIS_BATCH_SIZE
+                for start in range(0, len(records), batch_size):
+                    analyze_scraped_data.delay([r.pk for r in records[start:start + batch_size]])
             
         except Exception as e:
             print(f"❌ Failed {niche.name}: {e}")
     
-    return f"Scraping completed for {niches.count()} niches"
+    master_scraper.end_run()
+    
+    if inline:
+        print_cache_stats()
+    
+    return f"Scraping completed for {len(niches)} niches"
+
+@shared_task
+def analyze_scraped_data(scraped_data_ids):
+    """Run NLP and trend clustering over a batch of stored ScrapedData rows"""
+    records = list(ScrapedData.objects.filter(pk__in=scraped_data_ids).select_related('niche').order_by('pk'))
+    by_niche = {}
+    for record in records:
+        by_niche.setdefault(record.niche_id, []).append(record)
+    
+    for niche_records in by_niche.values():
+        niche = niche_records[0].niche
+        try:
+            analyze_records(niche, niche_records)
+        except Exception as e:
+            print(f"❌ Analysis failed for {niche.name}: {e}")
+    
+    print_cache_stats()
+    return f"Analysed {len(records)} items"
+
+@shared_task
+def apply_retention():
+    """Archive and delete expired scraped items, compact the rest and age out the NLP cache"""
+    archived = archive_expired()
+    compacted = compact_cleaned_data()
+    purged = sum(purge_nlp_cache().values())
+    for source, count in sorted(archived.items()):
+        print(f"🗄️ Archived {count} {source} items")
+    print(f"🗜️ Compacted {compacted} items")
+    print(f"🧠 Purged {purged} NLP cache entries")
+    return f"Archived {sum(archived.values())} items, compacted {compacted}, purged {purged} NLP cache entries"
+
+def load_data_sources():
+    """DataSource rows by source name, loaded once per run"""
+    sources = {}
+    for source in DataSource.objects.order_by('pk'):
+        sources.setdefault(source.name, source)
+    return sources
+
+def resolve_data_source(sources, name):
+    """DataSource for a source name, created (and remembered) the first time it is seen"""
+    if name not in sources:
+        sources[name] = DataSource.objects.get_or_create(name=name, defaults={'is_active': True})[0]
+    return sources[name]
+
+def build_scraped_records(niche, scraped_data, sources, index):
+    """
+    Unsaved ScrapedData rows for a niche's scraped items. Returns
+    (new records, repeats, number of near-duplicates collapsed).
+
+    Items already stored for the niche (same content fingerprint) come back
+    as repeats: they only refresh the stored row's data on save and are not
+    analysed again. Syndicated copies of stories in the near-duplicate index
+    are left out, and counted against their story only the first time.
+    """
+    candidates = []
+    for data_item in scraped_data:
+        text = extract_text_from_data(data_item)
+        source = data_item.get('source', 'unknown')
+        fingerprint = content_fingerprint(source, data_item.get('link') or data_item.get('url'), text)
+        candidates.append((data_item, text, source, fingerprint))
+    fingerprints = [c[3] for c in candidates if c[3]]
+    stored = stored_fingerprints(niche, fingerprints)
+    copies = stored_fingerprints(niche, fingerprints, DuplicateCopy)
+    
+    records, repeats, seen = [], [], set()
+    duplicates = 0
+    for data_item, text, source, fingerprint in candidates:
+        if fingerprint is not None:
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+        
+        if fingerprint in copies:
+            # A copy collapsed on an earlier run, already counted
+            continue
+        
+        is_repeat = fingerprint in stored
+        dedupe = not is_repeat and bool(text) and source.startswith(DEDUPE_SOURCE_PREFIX)
+        if dedupe and index.duplicate_of(text, fingerprint) is not None:
+            duplicates += 1
+            continue
+        
+        record = ScrapedData(
+            niche=niche,
+            source=resolve_data_source(sources, source),
+            raw_data=data_item,
+            cleaned_data=clean_data(data_item),
+            fingerprint=fingerprint,
+        )
+        if is_repeat:
+            repeats.append(record)
+            continue
+        if dedupe:
+            index.add(text, record)
+        records.append(record)
+    return records, repeats, duplicates
+
+def stored_fingerprints(niche, fingerprints, model=ScrapedData):
+    """The given fingerprints that the niche already has rows for (items, or collapsed copies with DuplicateCopy)"""
+    stored = set()
+    batch_size = settings.INGEST_BATCH_SIZE
+    for start in range(0, len(fingerprints), batch_size):
+        stored.update(model.objects.filter(
+            niche=niche, fingerprint__in=fingerprints[start:start + batch_size]
+        ).values_list('fingerprint', flat=True))
+    return stored
+
+def save_scraped_records(records, index, repeats=()):
+    """
+    Insert a niche's records in batches and persist its dedupe index, in one
+    transaction. Rows whose fingerprint is already stored (repeats, or items
+    stored concurrently since they were built) update that row's scraped
+    data instead.
+    """
+    write(_insert_scraped_records, records, index, repeats)
+
+def _insert_scraped_records(records, index, repeats):
+    ScrapedData.objects.bulk_create(
+        [*records, *repeats],
+        batch_size=settings.INGEST_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['niche', 'fingerprint'],
+        update_fields=['raw_data', 'cleaned_data'],
+    )
+    index.save()
+
+def annotate_records(niche, records):
+    """
+    Set keywords and sentiment on a niche's records in place.
+    Returns the records that had text to analyse.
+    """
+    analysed = [r for r in records if extract_text_from_data(r.raw_data)]
+    texts = [extract_text_from_data(r.raw_data) for r in analysed]
+    
+    # Extract keywords for the whole niche batch in one pass
+    keyword_lists = extract_keywords_batch(
+        texts,
+        batch_size=settings.NLP_BATCH_SIZE,
+        n_process=settings.NLP_N_PROCESS,
+        niche=niche,
+    )
+    
+    sentiments = analyze_sentiment_batch(texts)
+    
+    for record, keywords, sentiment in zip(analysed, keyword_lists, sentiments):
+        record.keywords = keywords
+        record.sentiment = sentiment
+    return analysed
+
+def cluster_records(niche, records):
+    """Significant analysed items join an open trend of the niche, or start one"""
+    clusterer = TrendClusterer.load(niche)
+    for record in records:
+        if len(record.keywords) > 0 and record.sentiment > 0.1:
+            clusterer.assign(
+                record.keywords, record.sentiment,
+                score=calculate_trend_score(record.raw_data),
+                source=record.raw_data.get('source', 'multiple'),
+            )
+    write(clusterer.save)
+    
+    print(f"✅ Analysed {niche.name}: {len(records)} items, "
+          f"{clusterer.created} new trends, {clusterer.merged} items merged into open trends")
+
+def analyze_records(niche, records):
+    """Keywords and sentiment for a niche's stored items, then trend clustering"""
+    analysed = annotate_records(niche, records)
+    write(ScrapedData.objects.bulk_update, analysed, ['keywords', 'sentiment'], batch_size=settings.INGEST_BATCH_SIZE)
+    cluster_records(niche, analysed)
+
+def print_cache_stats():
+    for kind, stats in cache_stats().items():
+        print(f"🧠 NLP cache ({kind}): {stats['memory_hits']} memory / {stats['db_hits']} db hits, "
+              f"{stats['misses']} misses ({stats['hit_rate']:.0%})")
 
 def extract_text_from_data(data_item):
     """Extract text content from various data formats"""
@@ -69,30 +257,6 @@ def clean_data(data_item):
     cleaned = {k: v for k, v in data_item.items() if not k.startswith('_')}
     return cleaned
 
-def create_trend_from_scraped_data(niche, keywords, sentiment, source_data):
-    """Create Trend record from scraped data"""
-    # Calculate score based on source and engagement
-    score = calculate_trend_score(source_data)
-    
-    trend = Trend.objects.create(
-        niche=niche,
-        keywords=keywords,
-        sentiment=sentiment,
-        score=score,
-        source=source_data.get('source', 'multiple')
-    )
-    
-    # Create ad keywords
-    for keyword in keywords[:5]:  # Limit to top 5 keywords
-        AdKeyword.objects.create(
-            trend=trend,
-            keyword=keyword,
-            performance_score=sentiment * score,
-            source=source_data.get('source', 'unknown')
-        )
-    
-    return trend
-
 def calculate_trend_score(source_data):
     """Calculate trend score based on source-specific metrics"""
     source = source_data.get('source', '')
@@ -1,3 +1,968 @@
-from django.test import TestCase
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from textblob import TextBlob
+
+from core.db import WriteBatcher, apply_sqlite_pragmas, inspect_only
+from core.models import (
+    AdKeyword, DataSource, DuplicateCopy, FeedCache, FeedHealth, HeadlineFingerprint, Niche, NicheTermStats, NLPCacheEntry, ScrapedData, Trend,
+)
+from core.scrapers import ai_marketplace_scraper
+from core.scrapers.ai_marketplace_scraper import AIMarketplaceScraper, CallBudget
+from core.scrapers.base_scraper import BaseScraper
+from core.scrapers.circuit_breaker import BreakerRegistry, CircuitBreaker, breakers
+from core.scrapers.keyword_matcher import matcher_for, resolve_niche_keywords
+from core.scrapers.news_scraper import NewsScraper
+from core.scrapers.rate_limiter import HostRateLimiter, TokenBucket, host_limiter
+from core.scrapers.response_cache import ResponseCache
+from core.services import ml_services
+from core.services.dedupe import NearDuplicateIndex, minhash, similarity
+from core.services.feed_cache import fetch_feed
+from core.services.feed_registry import FeedRegistry
+from core.services.ml_services import _cached_batch
+from core.services.niche_classifier import NicheClassifier
+from core.services.nlp_cache import NLPCache
+from core.services.retention import (
+    archive_expired, archive_partitions, compact_cleaned_data, purge_nlp_cache, read_archive,
+)
+from core.services.sentiment_engine import get_scorer
+from core.services.tfidf_keywords import TfidfKeywordExtractor
+from core.services.trend_clustering import TrendClusterer
+from core.tasks import (
+    build_scraped_records, clean_data, load_data_sources, resolve_data_source, run_multi_source_scraping,
+    save_scraped_records,
+)
+
+# Headlines exercising the lexicon rules: modifiers, negation, contractions,
+# exclamation marks, abbreviations and punctuation
+SENTIMENT_CORPUS = [
+    "Safaricom's M-Pesa hits record: 'best quarter ever' -- CEO",
+    "Nairobi traffic (again) worse than last year...",
+    "Why Kenya's startups aren't failing: a surprisingly good 2024",
+    "Fuel prices rise 5.6% in Q3; consumers unhappy!!",
+    "Mr. Ruto says the U.S. deal is 'not bad at all'",
+    "Heavy rains cause deadly floods in Mombasa",
+    "Experts: AI won't replace teachers anytime soon",
+    '"Incredible" comeback for Harambee Stars',
+    "Is this the end of cheap loans? Banks hike rates",
+    "Very very good results for local farmers",
+    "Not a good day for the shilling",
+    "Really not good news for importers",
+    "This is really a great deal!",
+    "Terribly bad service, never again",
+    "No clear winner in the smartphone price war",
+    "The market isn't happy with the new tax",
+    "",
+    "12345",
+]
+
+
+class LexiconSentimentParityTests(SimpleTestCase):
+    def test_matches_textblob_polarity(self):
+        scores = get_scorer().polarity_batch(SENTIMENT_CORPUS)
+        for text, score in zip(SENTIMENT_CORPUS, scores):
+            with self.subTest(text=text):
+                self.assertAlmostEqual(score, TextBlob(text).sentiment.polarity, places=6)
+
+    def test_batch_matches_single_texts(self):
+        scorer = get_scorer()
+        batch = scorer.score_batch(SENTIMENT_CORPUS)
+        singles = [scorer.score_batch([text])[0] for text in SENTIMENT_CORPUS]
+        self.assertEqual(len(batch), len(SENTIMENT_CORPUS))
+        for a, b in zip(batch, singles):
+            self.assertAlmostEqual(a, b, places=9)
+
+    def test_scale(self):
+        self.assertEqual(get_scorer().score_batch(['', 'Kenya 2024']), [0.5, 0.5])
+        self.assertEqual(get_scorer().score_batch([]), [])
+
+
+class KeywordMatcherTests(SimpleTestCase):
+    keywords = ['solar', 'solar energy', 'solar panel', 'IT', 'ai', 'e-commerce', 'computer', 'computer']
+
+    def reference(self, text):
+        """The per-keyword regex scan NewsScraper used before the matcher"""
+        matches = score = 0
+        for keyword in self.keywords:
+            whole_word = re.search(r'\b' + re.escape(keyword) + r'\b', text, re.IGNORECASE)
+            matches += bool(whole_word)
+            if keyword in text:
+                score += 15 if whole_word else 5
+        return matches, min(score, 100)
+
+    def test_matches_per_keyword_regex_scan(self):
+        texts = [
+            'solar energy and solar panels: is it worth it?',
+            'solarpanel prices fall as ai chips get cheaper',
+            'e-commerce growth; computer sales up',
+            'nothing relevant here',
+            'maintain training ai.',
+            '',
+        ]
+        matcher = matcher_for(self.keywords)
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(matcher.match(text), self.reference(text))
+
+    def test_resolve_niche_keywords(self):
+        mapping = {'solar energy': ['solar'], 'technology': ['tech']}
+        self.assertEqual(resolve_niche_keywords(mapping, 'Solar'), ['solar'])
+        self.assertEqual(resolve_niche_keywords(mapping, 'tech'), ['tech'])
+        self.assertEqual(resolve_niche_keywords(mapping, 'Pets'), ['pets'])
+
+    def test_cache_follows_keyword_changes(self):
+        self.assertIs(matcher_for(['a', 'b']), matcher_for(['a', 'b']))
+        self.assertEqual(matcher_for(['a', 'b', 'c']).match('a b c')[0], 3)
+
+
+class NicheClassifierTests(SimpleTestCase):
+    def setUp(self):
+        news = {'technology': ['tech', 'AI', 'cloud computing', 'startup'], 'solar energy': ['solar', 'solar panel']}
+        categories = {'solar energy': ['solar battery', 'inverter'], 'agriculture': ['tractor', 'seeds']}
+        self.classifier = NicheClassifier.from_mappings(
+            [news, categories], ['technology', 'solar energy', 'agriculture']
+        )
+
+    def test_scores_every_niche_in_one_pass(self):
+        results = self.classifier.classify([
+            'AI startup moves to cloud computing',
+            'Solar panel and solar battery prices drop',
+            'Tractor sales',
+            'Solar startup uses AI for inverter design',
+        ])
+        # Scored like KeywordMatcher: 'AI' (has capitals) matches but earns no points
+        self.assertEqual(results[0], [('technology', 30)])
+        self.assertEqual(results[1], [('solar energy', 45)])
+        self.assertEqual(results[2], [])
+        self.assertEqual(sorted(results[3]), [('solar energy', 30), ('technology', 15)])
+
+    def test_whole_words_only(self):
+        self.assertEqual(self.classifier.classify(['Retaining startups, solarium tech']), [[]])
+        self.assertEqual(self.classifier.classify([]), [])
+
+    def test_agrees_with_per_niche_matching(self):
+        scraper = NewsScraper()
+        niches = list(scraper.niche_keywords)
+        classifier = NicheClassifier.from_mappings([scraper.niche_keywords], niches)
+        entries = [
+            {'title': 'Schools get a new computer lab in Kisumu'},
+            {'title': 'Solar-powered irrigation helps farmers', 'summary': 'Crop yields rise with solar pumps'},
+            {'title': 'Fintech startup launches M-Pesa savings app', 'summary': 'Mobile money for SMEs'},
+            {'title': 'Heavy rains cause floods in Mombasa county'},
+        ]
+        results = classifier.classify([f"{e['title']} {e.get('summary', '')}" for e in entries])
+        for entry, labels in zip(entries, results):
+            expected = []
+            for niche in niches:
+                matches, score = scraper.match_niche(entry, niche)
+                if matches >= 2:
+                    expected.append((niche, score))
+            self.assertEqual(sorted(labels), sorted(expected), entry['title'])
+        self.assertIn(('technology', 30), results[0])
+
+
+class NearDuplicateIndexTests(TestCase):
+    def setUp(self):
+        self.niche = Niche.objects.create(name='business')
+        self.source = DataSource.objects.create(name='news')
+
+    def store(self, index, title):
+        record = ScrapedData.objects.create(niche=self.niche, source=self.source, raw_data={'title': title})
+        index.add(title, record)
+        return record
+
+    def test_similar_headlines_share_signatures(self):
+        a = minhash('Kenya: Ruto signs finance bill into law')
+        b = minhash('Ruto signs Finance Bill 2024 into law')
+        c = minhash('Heavy rains cause floods in Mombasa county')
+        self.assertGreaterEqual(similarity(a, b), 0.5)
+        self.assertLess(similarity(a, c), 0.3)
+        self.assertIsNone(minhash('Too short'))
+
+    def test_copies_collapse_into_canonical_item_across_runs(self):
+        index = NearDuplicateIndex.load(self.niche)
+        original = self.store(index, 'Safaricom posts record profit as M-Pesa revenue grows')
+        self.assertEqual(index.duplicate_of('Safaricom posts record profit as M-Pesa revenue grows'), original.pk)
+        self.assertIsNone(index.duplicate_of('Central bank holds interest rate at 12 percent'))
+        index.save()
+
+        # A later run sees the persisted fingerprint
+        index = NearDuplicateIndex.load(self.niche)
+        copy = 'Kenya: Safaricom posts record profit as M-Pesa revenue grows'
+        self.assertEqual(index.duplicate_of(copy, fingerprint='f' * 40), original.pk)
+        index.save()
+
+        original.refresh_from_db()
+        self.assertEqual(original.duplicate_count, 2)
+        self.assertEqual(original.engagement_score, 2.0)
+        self.assertEqual(HeadlineFingerprint.objects.count(), 1)
+        # The copy's identity is remembered so a rerun doesn't count it again
+        self.assertEqual(list(original.copies.values_list('fingerprint', flat=True)), ['f' * 40])
+
+    def test_window_is_per_niche(self):
+        index = NearDuplicateIndex.load(self.niche)
+        self.store(index, 'Safaricom posts record profit as M-Pesa revenue grows')
+        index.save()
+        other = NearDuplicateIndex.load(Niche.objects.create(name='technology'))
+        self.assertIsNone(other.find('Safaricom posts record profit as M-Pesa revenue grows'))
+
+
+class TfidfKeywordExtractorTests(TestCase):
+    def setUp(self):
+        self.niche = Niche.objects.create(name='business')
+        self.extractor = TfidfKeywordExtractor(n_features=2 ** 12)
+
+    def test_corpus_wide_terms_rank_below_distinctive_ones(self):
+        background = [f'Kenya market update number {i} for traders' for i in range(20)]
+        self.extractor.extract(background, niche=self.niche)
+        keywords = self.extractor.extract(['Kenya market reacts to Safaricom dividend'], niche=self.niche)[0]
+        self.assertIn('safaricom dividend', keywords)
+        self.assertNotIn('kenya', keywords[:2])
+        self.assertLessEqual(len(keywords), 5)
+
+    def test_statistics_accumulate_per_niche(self):
+        self.extractor.extract(['Solar panel prices fall'] * 3, niche=self.niche)
+        self.extractor.extract(['Solar panel prices fall'], niche=self.niche)
+        self.extractor.extract(['Solar panel prices fall'])
+        stats = NicheTermStats.objects.get(niche=self.niche)
+        self.assertEqual(stats.n_docs, 4)
+        self.assertEqual(NicheTermStats.objects.get(niche=None).n_docs, 1)
+        self.assertEqual(self.extractor.extract([]), [])
+
+    def test_keywords_are_deterministic(self):
+        text = 'Central bank holds interest rate as inflation eases'
+        first = self.extractor.extract([text], niche=self.niche, update=False)
+        self.assertEqual(first, self.extractor.extract([text], niche=self.niche, update=False))
+
+
+class TrendClustererTests(TestCase):
+    def setUp(self):
+        self.niche = Niche.objects.create(name='business')
+
+    def test_similar_items_update_one_trend(self):
+        clusterer = TrendClusterer.load(self.niche)
+        first = clusterer.assign(['Safaricom', 'M-Pesa revenue', 'record profit'], 0.8, score=1.0, source='news')
+        second = clusterer.assign(['Safaricom profit', 'M-Pesa'], 0.6, score=0.5, source='news')
+        other = clusterer.assign(['floods', 'Mombasa county'], 0.2, score=1.0, source='news')
+        clusterer.save()
+
+        self.assertEqual(first.pk, second.pk)
+        self.assertNotEqual(first.pk, other.pk)
+        trend = Trend.objects.get(pk=first.pk)
+        self.assertEqual(trend.item_count, 2)
+        self.assertAlmostEqual(trend.sentiment, 0.7)
+        self.assertAlmostEqual(trend.score, 0.75)
+        self.assertEqual(trend.keywords, ['Safaricom', 'M-Pesa revenue', 'record profit', 'Safaricom profit', 'M-Pesa'])
+        self.assertEqual(AdKeyword.objects.filter(trend=trend).count(), 5)
+        self.assertAlmostEqual(AdKeyword.objects.filter(trend=trend).first().performance_score, 0.7 * 0.75)
+
+    def test_stale_trends_are_closed(self):
+        stale = Trend.objects.create(niche=self.niche, keywords=['Safaricom', 'profit'], sentiment=0.5, score=1.0)
+        Trend.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(days=5))
+        clusterer = TrendClusterer.load(self.niche)
+        trend = clusterer.assign(['Safaricom', 'profit'], 0.5, score=1.0, source='news')
+        clusterer.save()
+        self.assertNotEqual(trend.pk, stale.pk)
+        self.assertFalse(Trend.objects.get(pk=stale.pk).is_open)
+
+    def test_batch_is_written_in_a_few_statements(self):
+        existing = Trend.objects.create(niche=self.niche, keywords=['floods', 'Mombasa'], sentiment=0.5, score=1.0)
+        AdKeyword.objects.create(trend=existing, keyword='floods', performance_score=0.5, source='news')
+        clusterer = TrendClusterer.load(self.niche)
+        for i in range(20):
+            clusterer.assign([f'story{i}', f'county{i}', 'Kenya'], 0.5, score=1.0, source='news')
+            clusterer.assign(['floods', 'Mombasa', 'rain'], 0.7, score=0.5, source='news')
+
+        # Savepoint, trend insert, trend update, AdKeyword insert and update, release
+        with self.assertNumQueries(6):
+            clusterer.save()
+
+        self.assertEqual(clusterer.created, 20)
+        self.assertEqual(Trend.objects.filter(niche=self.niche).count(), 21)
+        new = Trend.objects.get(keywords=['story3', 'county3', 'Kenya'])
+        self.assertEqual(list(AdKeyword.objects.filter(trend=new).values_list('keyword', flat=True)),
+                         ['story3', 'county3', 'Kenya'])
+        existing.refresh_from_db()
+        self.assertEqual(existing.item_count, 21)
+        self.assertEqual(existing.keywords, ['floods', 'Mombasa', 'rain'])
+        for ad_keyword in AdKeyword.objects.filter(trend=existing):
+            self.assertAlmostEqual(ad_keyword.performance_score, existing.sentiment * existing.score)
+        self.assertEqual(AdKeyword.objects.filter(trend=existing).count(), 2)
+
+
+class BulkIngestionTests(TestCase):
+    def setUp(self):
+        self.niche = Niche.objects.create(name='business')
+        self.news = DataSource.objects.create(name='news')
+
+    def test_items_are_stored_in_bulk_with_duplicates_collapsed(self):
+        items = [
+            {'source': 'news', 'title': 'Safaricom posts record profit as M-Pesa revenue grows'},
+            {'source': 'news', 'title': 'Kenya: Safaricom posts record profit as M-Pesa revenue grows'},
+            {'source': 'reddit', 'title': 'Central bank holds interest rate at 12 percent', '_raw': 1},
+        ]
+        sources = load_data_sources()
+        index = NearDuplicateIndex.load(self.niche)
+        records, repeats, duplicates = build_scraped_records(self.niche, items, sources, index)
+        self.assertEqual((len(repeats), duplicates), (0, 1))
+        self.assertTrue(all(r.pk is None for r in records))
+
+        with self.assertNumQueries(6):
+            save_scraped_records(records, index, repeats)
+
+        self.assertEqual(ScrapedData.objects.count(), 2)
+        original = ScrapedData.objects.get(pk=records[0].pk)
+        self.assertEqual(original.source, self.news)
+        self.assertEqual(original.duplicate_count, 1)
+        self.assertEqual(records[1].cleaned_data, {'source': 'reddit', 'title': items[2]['title']})
+        self.assertEqual(HeadlineFingerprint.objects.get().scraped_data, original)
+        self.assertEqual(DuplicateCopy.objects.get().canonical, original)
+        # Sources are resolved once: the new one is remembered for the rest of the run
+        self.assertIs(resolve_data_source(sources, 'reddit'), records[1].source)
+
+    def test_rerun_refreshes_stored_items_instead_of_duplicating_them(self):
+        items = [
+            {'source': 'reddit', 'title': 'Central bank holds interest rate at 12 percent', 'score': 10,
+             'url': 'https://Reddit.com/r/Kenya/abc/?utm_source=feed'},
+            {'source': 'amazon', 'title': 'Tecno Spark 20', 'link': 'https://amazon.com/search?q=phones'},
+            {'source': 'amazon', 'title': 'Infinix Hot 40', 'link': 'https://amazon.com/search?q=phones'},
+            {'source': 'news', 'title': 'Safaricom posts record profit as M-Pesa revenue grows',
+             'link': 'https://nation.africa/safaricom-profit'},
+            {'source': 'news', 'title': 'Kenya: Safaricom posts record profit as M-Pesa revenue grows',
+             'link': 'https://allafrica.com/stories/safaricom'},
+        ]
+        sources = load_data_sources()
+        index = NearDuplicateIndex.load(self.niche)
+        records, repeats, duplicates = build_scraped_records(self.niche, items, sources, index)
+        self.assertEqual(duplicates, 1)
+        records[0].keywords = ['interest rate']
+        save_scraped_records(records, index, repeats)
+        self.assertEqual(ScrapedData.objects.count(), 4)
+
+        rerun = [dict(items[0], score=250, url='https://reddit.com/r/Kenya/abc'), items[1], items[3], items[4]]
+        index = NearDuplicateIndex.load(self.niche)
+        records, repeats, duplicates = build_scraped_records(self.niche, rerun * 2, sources, index)
+        self.assertEqual((len(records), len(repeats), duplicates), (0, 3, 0))
+        save_scraped_records(records, index, repeats)
+
+        self.assertEqual(ScrapedData.objects.count(), 4)
+        stored = ScrapedData.objects.get(pk=repeats[0].pk)
+        self.assertEqual(stored.raw_data['score'], 250)
+        self.assertEqual(stored.keywords, ['interest rate'])
+        # The syndicated copy seen again is not counted twice
+        story = ScrapedData.objects.get(raw_data__link=items[3]['link'])
+        self.assertEqual((story.duplicate_count, story.engagement_score), (1, 1.0))
+
+
+class MultiNicheNewsTests(TestCase):
+    feeds = {
+        'https://example.com/a.rss': ['AI startup raises funds', 'Solar panel prices drop', 'Football results'],
+        'https://example.com/b.rss': ['Solar startup uses AI for panel design', 'New tractor and seeds prices'],
+    }
+
+    def load_feed(self, feed_url):
+        return {'bozo': False, 'entries': [
+            {'title': title, 'link': f"{feed_url}#{i}"} for i, title in enumerate(self.feeds[feed_url])
+        ]}
+
+    def test_each_feed_is_classified_once_for_all_niches(self):
+        scraper = NewsScraper()
+        scraper.feeds = list(self.feeds)
+        niches = ['technology', 'solar energy', 'agriculture']
+        classifier = NicheClassifier.from_mappings(
+            [{'technology': ['AI', 'startup'], 'solar energy': ['solar', 'panel'], 'agriculture': ['tractor', 'seeds']}], niches
+        )
+        with mock.patch.object(scraper, 'load_feed', side_effect=self.load_feed), \
+                mock.patch.object(classifier, 'classify', wraps=classifier.classify) as classify:
+            results = scraper.scrape_niches(niches, classifier=classifier)
+
+        self.assertEqual(classify.call_count, len(self.feeds))
+        titles = {niche: sorted(a['title'] for a in articles) for niche, articles in results.items()}
+        self.assertEqual(titles, {
+            'technology': ['AI startup raises funds', 'Solar startup uses AI for panel design'],
+            'solar energy': ['Solar panel prices drop', 'Solar startup uses AI for panel design'],
+            'agriculture': ['New tractor and seeds prices'],
+        })
+
+    def test_scraping_task_prefetches_news_for_all_niches(self):
+        for name in ('technology', 'agriculture'):
+            Niche.objects.create(name=name)
+        articles = {'technology': [], 'agriculture': []}
+        with mock.patch('core.tasks.MasterScraper') as master:
+            scraper = master.return_value
+            scraper.prefetch_news.return_value = articles
+            scraper.scrape_all_sources.return_value = []
+            run_multi_source_scraping()
+
+        scraper.prefetch_news.assert_called_once_with(['technology', 'agriculture'])
+        self.assertEqual(scraper.scrape_all_sources.call_args_list, [
+            mock.call('technology', prefetched={'news': articles['technology']}),
+            mock.call('agriculture', prefetched={'news': articles['agriculture']}),
+        ])
+
+
+class SqliteProfileTests(TestCase):
+    def test_pragmas_are_applied_to_connections(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+    def test_inspecting_commands_keep_the_journal_mode_of_the_file(self):
+        self.assertTrue(inspect_only(['manage.py', 'makemigrations', '--check']))
+        self.assertFalse(inspect_only(['manage.py', 'migrate']))
+        self.assertFalse(inspect_only(['celery', '-A', 'trendy_project', 'worker']))
+
+        sqlite = mock.MagicMock(vendor='sqlite')
+        executed = sqlite.cursor.return_value.__enter__.return_value.execute
+        for argv, journal_mode in ((['manage.py', 'check'], False), (['manage.py', 'runserver'], True)):
+            executed.reset_mock()
+            with mock.patch('core.db.sys.argv', argv):
+                apply_sqlite_pragmas(None, sqlite)
+            statements = [c.args[0] for c in executed.call_args_list]
+            self.assertIn('PRAGMA busy_timeout = 5000', statements)
+            self.assertEqual('PRAGMA journal_mode = WAL' in statements, journal_mode)
+
+
+class WriteBatcherTests(TransactionTestCase):
+    def setUp(self):
+        self.batcher = WriteBatcher(max_delay=0.2)
+
+    def tearDown(self):
+        self.batcher.close()
+
+    def test_concurrent_writers_share_transactions(self):
+        def writer(i):
+            return self.batcher.submit(lambda: Niche.objects.create(name=f'niche {i}').pk).result()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pks = list(pool.map(writer, range(40)))
+
+        self.assertEqual(Niche.objects.filter(pk__in=pks).count(), 40)
+        self.assertEqual(self.batcher.jobs, 40)
+        self.assertLess(self.batcher.transactions, 40)
+
+    def test_failing_job_does_not_roll_back_the_batch(self):
+        def fail():
+            Niche.objects.create(name='rolled back')
+            raise ValueError('bad item')
+
+        ok = self.batcher.submit(Niche.objects.create, name='kept')
+        bad = self.batcher.submit(fail)
+        self.assertEqual(ok.result().name, 'kept')
+        with self.assertRaises(ValueError):
+            bad.result()
+        self.assertEqual(list(Niche.objects.values_list('name', flat=True)), ['kept'])
+
+
+@override_settings(RETENTION_DAYS={'default': 90, 'news': 30}, COMPACT_AFTER_DAYS=7)
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.niche = Niche.objects.create(name='business')
+        self.news = DataSource.objects.create(name='news')
+        self.amazon = DataSource.objects.create(name='amazon')
+
+    def scraped(self, source, days_old, title):
+        data = {'source': source.name, 'title': title, '_raw': 1}
+        record = ScrapedData.objects.create(
+            niche=self.niche, source=source, raw_data=data, cleaned_data=clean_data(data)
+        )
+        ScrapedData.objects.filter(pk=record.pk).update(created_at=timezone.now() - timedelta(days=days_old))
+        return record
+
+    def test_expired_items_are_archived_then_deleted(self):
+        old_news = [self.scraped(self.news, 40, f'Old story {i}') for i in range(3)]
+        recent_news = self.scraped(self.news, 10, 'Recent story')
+        product = self.scraped(self.amazon, 40, 'Tecno Spark 20')
+
+        self.assertEqual(archive_expired(root=self.root.name, dry_run=True), {'news': 3, 'amazon': 0})
+        self.assertEqual(archive_expired(root=self.root.name, chunk_size=2), {'news': 3, 'amazon': 0})
+
+        self.assertEqual(set(ScrapedData.objects.values_list('pk', flat=True)), {recent_news.pk, product.pk})
+        self.assertEqual(len(archive_partitions('news', root=self.root.name)), 1)
+        archived = list(read_archive(root=self.root.name))
+        self.assertEqual([row['id'] for row in archived], [r.pk for r in old_news])
+        self.assertEqual(archived[0]['raw_data']['title'], 'Old story 0')
+        self.assertEqual(archived[0]['niche'], 'business')
+
+    def test_source_config_overrides_policy(self):
+        self.amazon.config = {'retention_days': 20}
+        self.amazon.save()
+        self.news.config = {'retention_days': None}
+        self.news.save()
+        self.scraped(self.amazon, 40, 'Tecno Spark 20')
+        self.scraped(self.news, 400, 'Ancient story')
+        self.assertEqual(archive_expired(root=self.root.name), {'amazon': 1})
+        self.assertEqual(list(ScrapedData.objects.values_list('source__name', flat=True)), ['news'])
+
+    def test_derivable_cleaned_data_is_compacted(self):
+        old = self.scraped(self.amazon, 10, 'Tecno Spark 20')
+        edited = self.scraped(self.amazon, 10, 'Infinix Hot 40')
+        ScrapedData.objects.filter(pk=edited.pk).update(cleaned_data={'title': 'Infinix HOT 40'})
+        recent = self.scraped(self.amazon, 1, 'Samsung A15')
+
+        self.assertEqual(compact_cleaned_data(chunk_size=1), 1)
+        self.assertIsNone(ScrapedData.objects.get(pk=old.pk).cleaned_data)
+        self.assertIsNotNone(ScrapedData.objects.get(pk=edited.pk).cleaned_data)
+        self.assertIsNotNone(ScrapedData.objects.get(pk=recent.pk).cleaned_data)
+
+
+    @override_settings(NLP_CACHE_DAYS=30)
+    def test_nlp_cache_ages_out(self):
+        version = ml_services.sentiment_cache.version
+        for text_hash, entry_version, value in (('1' * 40, version, 0.6), ('2' * 40, version, 0.4),
+                                                ('3' * 40, 'textblob==0.1', 0.5)):
+            NLPCacheEntry.objects.create(kind='sentiment', version=entry_version, text_hash=text_hash, value=value)
+        NLPCacheEntry.objects.filter(value=0.4).update(created_at=timezone.now() - timedelta(days=31))
+
+        self.assertEqual(purge_nlp_cache(), {'keywords': 0, 'sentiment': 2})
+        self.assertEqual(list(NLPCacheEntry.objects.values_list('version', 'value')), [(version, 0.6)])
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('core.scrapers.circuit_breaker.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+
+    def test_opens_after_consecutive_failures(self):
+        self.assertFalse(self.breaker.record_failure())
+        self.breaker.record_success()  # Resets the streak
+        self.assertFalse(self.breaker.record_failure())
+        self.assertFalse(self.breaker.record_failure())
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.record_failure())
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.as_dict()['retry_in'], 60)
+
+    def open(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_half_open_lets_one_probe_through_and_closes_on_success(self):
+        self.open()
+        self.now += 61
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())  # Probe in flight
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        self.open()
+        self.now += 61
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.record_failure())
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.now += 30
+        self.assertFalse(self.breaker.allow())
+
+    def test_lost_probe_expires_after_cooldown(self):
+        self.open()
+        self.now += 61
+        self.assertTrue(self.breaker.allow())
+        self.now += 61
+        self.assertTrue(self.breaker.allow())
+
+    def test_registry_keys_breakers_by_host(self):
+        registry = BreakerRegistry(failure_threshold=1, cooldown=60)
+        registry.record_failure('https://Example.com/a')
+        self.assertFalse(registry.allow('https://example.com/b'))
+        self.assertTrue(registry.allow('https://other.com/'))
+        self.assertEqual(registry.open_hosts(), ['example.com'])
+        registry.reset()
+        self.assertEqual(registry.states(), {})
+
+
+class StubScraper(BaseScraper):
+    backoff_base = 0.0
+    default_rate_limit = {'rate': 1000.0, 'burst': 100}
+
+    def scrape(self, niche, **kwargs):
+        return []
+
+
+def fake_response(status, url='https://example.com/feed', body=b'ok'):
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response._content = body
+    return response
+
+
+class MakeRequestTests(SimpleTestCase):
+    url = 'https://example.com/feed'
+
+    def setUp(self):
+        breakers.reset()
+        self.addCleanup(breakers.reset)
+        self.scraper = StubScraper()
+        self.scraper.session = mock.Mock()
+
+    def test_transient_errors_are_retried(self):
+        self.scraper.session.request.side_effect = [
+            requests.ConnectionError('reset'), fake_response(503), fake_response(200),
+        ]
+        self.assertEqual(self.scraper.make_request(self.url).status_code, 200)
+        self.assertEqual(self.scraper.session.request.call_count, 3)
+        self.assertEqual(breakers.get(self.url).failures, 0)
+
+    def test_client_errors_are_not_retried_and_count_as_success(self):
+        breakers.record_failure(self.url)
+        self.scraper.session.request.return_value = fake_response(404)
+        self.assertIsNone(self.scraper.make_request(self.url))
+        self.assertEqual(self.scraper.session.request.call_count, 1)
+        # The host answered, so the failure streak is reset
+        self.assertEqual(breakers.get(self.url).failures, 0)
+
+    def test_exhausted_retries_count_one_failure_and_open_the_circuit(self):
+        self.scraper.session.request.return_value = fake_response(502)
+        for _ in range(3):
+            self.assertIsNone(self.scraper.make_request(self.url))
+        self.assertEqual(self.scraper.session.request.call_count, 3 * (self.scraper.max_retries + 1))
+        self.assertEqual(breakers.get(self.url).state, CircuitBreaker.OPEN)
+
+        self.assertIsNone(self.scraper.make_request(self.url))
+        self.assertEqual(self.scraper.session.request.call_count, 9)  # Skipped: circuit open
+
+    def test_is_transient(self):
+        self.assertTrue(self.scraper.is_transient(requests.Timeout()))
+        self.assertTrue(self.scraper.is_transient(requests.HTTPError(response=fake_response(429))))
+        self.assertFalse(self.scraper.is_transient(requests.HTTPError(response=fake_response(403))))
+        self.assertFalse(self.scraper.is_transient(requests.RequestException('bad url')))
+
+
+class RateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        for name, fake in (('monotonic', lambda: self.now), ('sleep', mock.Mock())):
+            patcher = mock.patch(f'core.scrapers.rate_limiter.time.{name}', fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        host_limiter.reset()
+        self.addCleanup(host_limiter.reset)
+
+    def test_reservations_queue_behind_each_other(self):
+        bucket = TokenBucket(rate=2, burst=2)
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0.0, 0.0, 0.5, 1.0])
+        # Tokens earned meanwhile pay off the queue before a new caller gets one
+        self.now += 1.0
+        self.assertEqual(bucket.reserve(), 0.5)
+        self.now += 10.0
+        self.assertEqual(bucket.acquire(), 0.0)
+
+    def test_latest_budget_of_each_owner_applies_and_the_strictest_wins(self):
+        limiter = HostRateLimiter()
+        bucket = limiter.bucket('example.com', rate=1, burst=1, owner='news')
+        self.assertIs(limiter.bucket('example.com', rate=5, burst=2, owner='news'), bucket)
+        self.assertEqual((bucket.rate, bucket.burst), (5.0, 2.0))
+
+        limiter.bucket('example.com', rate=0.5, burst=1, owner='marketplace')
+        self.assertEqual((bucket.rate, bucket.burst), (0.5, 1.0))
+        limiter.bucket('example.com', rate=10, burst=4, owner='marketplace')
+        self.assertEqual((bucket.rate, bucket.burst), (5.0, 2.0))
+
+    def test_raised_source_config_takes_effect_without_restart(self):
+        scraper = StubScraper()
+        scraper.configure({'rate_limit': {'rate': 0.5, 'burst': 1}})
+        scraper.rate_limit('https://example.com/a')
+        scraper.configure({'rate_limit': {'rate': 4, 'burst': 3}})
+        scraper.rate_limit('https://example.com/b')
+        bucket = host_limiter._buckets['example.com']
+        self.assertEqual((bucket.rate, bucket.burst), (4.0, 3.0))
+
+
+class FeedCacheTests(TestCase):
+    url = 'https://example.com/rss'
+    rss = (
+        b'<?xml version="1.0"?><rss version="2.0"><channel><title>Example</title>'
+        b'<item><title>Safaricom posts record profit</title><link>https://example.com/a</link></item>'
+        b'<item><title>Central bank holds rate</title><link>https://example.com/b</link></item>'
+        b'</channel></rss>'
+    )
+
+    def feed_response(self, status, body=b'', **headers):
+        response = fake_response(status, self.url, body)
+        response.headers.update({'Content-Type': 'application/rss+xml; charset=utf-8', **headers})
+        return response
+
+    def test_not_modified_serves_stored_entries_without_parsing(self):
+        get = mock.Mock(return_value=self.feed_response(
+            200, self.rss, ETag='"v1"', **{'Last-Modified': 'Sat, 17 Oct 2026 08:00:00 GMT'}
+        ))
+        first = fetch_feed(self.url, get=get)
+        titles = [e['title'] for e in first['entries']]
+        self.assertEqual(titles, ['Safaricom posts record profit', 'Central bank holds rate'])
+        self.assertFalse(first['not_modified'])
+        self.assertEqual(get.call_args.kwargs['headers'], {})
+
+        get.return_value = self.feed_response(304)
+        with mock.patch('core.services.feed_cache.feedparser.parse') as parse:
+            second = fetch_feed(self.url, get=get)
+
+        parse.assert_not_called()
+        self.assertEqual(get.call_args.kwargs['headers'], {
+            'If-None-Match': '"v1"', 'If-Modified-Since': 'Sat, 17 Oct 2026 08:00:00 GMT',
+        })
+        self.assertEqual((second['status'], second['not_modified']), (304, True))
+        self.assertEqual(second['entries'], first['entries'])
+
+    def test_bozo_or_empty_downloads_keep_the_cache(self):
+        fetch_feed(self.url, get=mock.Mock(return_value=self.feed_response(200, self.rss, ETag='"v1"')))
+
+        broken = fetch_feed(self.url, get=mock.Mock(return_value=self.feed_response(
+            200, b'<rss><channel><item><title>Cut off', ETag='"v2"'
+        )))
+        self.assertTrue(broken['bozo'])
+        empty = fetch_feed(self.url, get=mock.Mock(return_value=self.feed_response(
+            200, b'<?xml version="1.0"?><rss version="2.0"><channel><title>Example</title></channel></rss>',
+            ETag='"v3"',
+        )))
+        self.assertEqual((empty['bozo'], empty['entries']), (False, []))
+
+        cached = FeedCache.objects.get(url=self.url)
+        self.assertEqual(cached.etag, '"v1"')
+        self.assertEqual(len(cached.entries), 2)
+
+
+class FeedRegistryTests(SimpleTestCase):
+    def registry(self, **records):
+        return FeedRegistry({url: FeedHealth(url=url, **fields) for url, fields in records.items()})
+
+    def test_order_dedupes_and_ranks_by_yield_then_latency(self):
+        registry = self.registry(
+            a={'niche_yields': {'business': {'fetches': 4, 'relevant': 0}}},
+            b={'niche_yields': {'business': {'fetches': 4, 'relevant': 8}}, 'avg_latency': 2.0},
+            c={'niche_yields': {'business': {'fetches': 4, 'relevant': 8}}, 'avg_latency': 0.5},
+        )
+        # New feeds ('d') get an optimistic yield of 1.0
+        self.assertEqual(registry.order(['a', 'b', 'a', 'c', 'd'], 'Business'), ['c', 'b', 'd', 'a'])
+
+    def test_failing_feeds_are_skipped_until_their_daily_retry(self):
+        registry = self.registry(
+            failing={'fetch_count': 10, 'error_rate': 0.9, 'last_fetched_at': timezone.now() - timedelta(hours=1)},
+            due={'fetch_count': 10, 'error_rate': 0.9, 'last_fetched_at': timezone.now() - timedelta(hours=25)},
+            young={'fetch_count': 2, 'error_rate': 1.0, 'last_fetched_at': timezone.now()},
+        )
+        self.assertEqual(sorted(registry.order(['failing', 'due', 'young'], 'business')), ['due', 'young'])
+
+    def test_recovered_feed_is_no_longer_skipped(self):
+        registry = self.registry(feed={})
+        for _ in range(100):
+            registry.record_fetch('feed', latency=1.0, ok=False, changed=False)
+        self.assertEqual(registry.order(['feed'], 'business'), [])
+
+        registry.record_fetch('feed', latency=1.0, ok=True, changed=True)
+        self.assertLess(registry.get('feed').error_rate, 0.8)
+        self.assertEqual(registry.order(['feed'], 'business'), ['feed'])
+        self.assertEqual(registry.get('feed').error_count, 100)
+
+
+class ResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = ResponseCache(self.directory.name, max_bytes=1000)
+
+    def test_entries_expire_after_ttl(self):
+        url = 'https://example.com/page'
+        with mock.patch('core.scrapers.response_cache.time.time', return_value=1000.0):
+            self.cache.set('GET', url, fake_response(200, url, b'<html>'))
+        with mock.patch('core.scrapers.response_cache.time.time', return_value=1100.0):
+            cached = self.cache.get('get', url, ttl=300)
+            self.assertEqual((cached.status_code, cached.content, cached.from_cache), (200, b'<html>', True))
+            self.assertIsNone(self.cache.get('GET', url, ttl=60))
+        self.assertIsNone(self.cache.get('GET', 'https://example.com/other', ttl=300))
+
+    def test_least_recently_used_entries_are_evicted_over_max_bytes(self):
+        def body_path(url):
+            return self.cache._paths(self.cache.key('GET', url))[1]
+
+        for i in range(3):
+            url = f'https://example.com/{i}'
+            self.cache.set('GET', url, fake_response(200, url, b'x' * 300))
+            os.utime(body_path(url), (100 + i, 100 + i))
+        # Reading page 0 makes it the most recently used
+        self.assertIsNotNone(self.cache.get('GET', 'https://example.com/0', ttl=300))
+
+        self.cache.set('GET', 'https://example.com/3', fake_response(200, 'https://example.com/3', b'x' * 300))
+
+        kept = [i for i in range(4) if self.cache.get('GET', f'https://example.com/{i}', ttl=300)]
+        self.assertEqual(kept, [0, 3])
+
+
+class MakeRequestCacheTests(SimpleTestCase):
+    url = 'https://example.com/page'
+
+    def setUp(self):
+        breakers.reset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        cache = ResponseCache(self.directory.name)
+        patcher = mock.patch('core.scrapers.base_scraper.get_response_cache', return_value=cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scraper = StubScraper()
+        self.scraper.cache_ttl = 300
+        self.scraper.session = mock.Mock()
+        self.scraper.session.request.side_effect = lambda method, url, **kwargs: fake_response(200, url)
+
+    def test_plain_gets_are_served_from_cache(self):
+        self.scraper.make_request(self.url)
+        response = self.scraper.make_request(self.url)
+        self.assertTrue(response.from_cache)
+        self.assertEqual(self.scraper.session.request.call_count, 1)
+
+    def test_other_requests_bypass_the_cache(self):
+        self.scraper.make_request(self.url)
+        self.scraper.make_request(self.url, headers={'If-None-Match': '"abc"'})
+        self.scraper.make_request(self.url, method='POST')
+        self.scraper.make_request(self.url, method='POST')
+        self.assertEqual(self.scraper.session.request.call_count, 4)
+
+    def test_only_200_responses_are_stored(self):
+        self.scraper.session.request.side_effect = lambda method, url, **kwargs: fake_response(204, url)
+        self.scraper.make_request(self.url)
+        self.scraper.make_request(self.url)
+        self.assertEqual(self.scraper.session.request.call_count, 2)
+
+
+class AIMarketplaceScraperTests(SimpleTestCase):
+    url = 'https://www.jumia.co.ke/catalog/?q=solar+panel'
+    products = [{'title': 'Solar Panel 100W', 'price': 'KSh 8,999', 'source': 'ai_scraper_json'}]
+
+    def setUp(self):
+        self.reset_state()
+        self.addCleanup(self.reset_state)
+        self.scraper = AIMarketplaceScraper()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = []
+
+    def reset_state(self):
+        ai_marketplace_scraper._api_health.update(ok=None, checked_at=None, probe=None)
+        ai_marketplace_scraper._result_cache.clear()
+        ai_marketplace_scraper._in_flight.clear()
+
+    def slow_scrape(self, url, marketplace, search_term):
+        """scrape_with_ai stand-in that holds the call open until released"""
+        self.calls.append(url)
+        self.started.set()
+        self.release.wait(5)
+        return list(self.products)
+
+    def run_concurrently(self, fn, threads=8):
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [executor.submit(fn) for _ in range(threads)]
+            # Hold the first call open while the other threads arrive
+            self.started.wait(5)
+            time.sleep(0.05)
+            self.release.set()
+            return [f.result() for f in futures]
+
+    def test_concurrent_health_checks_send_one_probe(self):
+        with mock.patch.object(self.scraper, 'scrape_with_ai', side_effect=self.slow_scrape):
+            results = self.run_concurrently(self.scraper.check_api)
+            self.assertTrue(self.scraper.check_api())
+
+        self.assertEqual(results, [True] * 8)
+        self.assertEqual(self.calls, [self.scraper.health_check_url])
+        # The probe's products are kept as a result for its URL
+        self.assertIn(self.scraper.health_check_url, ai_marketplace_scraper._result_cache)
+
+    def test_same_url_in_flight_is_requested_once(self):
+        budget = CallBudget(5)
+        fetch = lambda: self.scraper.fetch_products(self.url, 'jumia', 'solar panel', budget)
+        with mock.patch.object(self.scraper, 'scrape_with_ai', side_effect=self.slow_scrape):
+            results = self.run_concurrently(fetch, threads=2)
+
+        self.assertEqual(results, [self.products, self.products])
+        self.assertEqual(self.calls, [self.url])
+        self.assertEqual(budget.remaining, 4)
+        self.assertEqual(ai_marketplace_scraper._in_flight, {})
+
+    def test_exhausted_budget_falls_back_to_mock_products(self):
+        with mock.patch.object(self.scraper, 'scrape_with_ai') as scrape_with_ai:
+            products = self.scraper.scrape_job('jumia', 'solar panel', CallBudget(0))
+
+        scrape_with_ai.assert_not_called()
+        self.assertEqual(len(products), 2)
+        self.assertTrue(all(p['source'] == 'contextual_mock' for p in products))
+
+    def test_results_are_cached_for_result_ttl(self):
+        budget = CallBudget(5)
+        with mock.patch('core.scrapers.ai_marketplace_scraper.time') as clock, \
+                mock.patch.object(self.scraper, 'scrape_with_ai', return_value=self.products) as scrape_with_ai:
+            clock.monotonic.return_value = 1000.0
+            self.scraper.fetch_products(self.url, 'jumia', 'solar panel', budget)
+            clock.monotonic.return_value = 1000.0 + self.scraper.result_ttl - 1
+            self.assertEqual(self.scraper.fetch_products(self.url, 'jumia', 'solar panel', budget), self.products)
+            self.assertEqual((scrape_with_ai.call_count, budget.remaining), (1, 4))
+
+            clock.monotonic.return_value = 1000.0 + self.scraper.result_ttl
+            self.scraper.fetch_products(self.url, 'jumia', 'solar panel', budget)
+            self.assertEqual((scrape_with_ai.call_count, budget.remaining), (2, 3))
+
+
+class NLPCacheTests(TestCase):
+    def test_memory_tier_then_db_tier(self):
+        cache = NLPCache('sentiment', 'lexicon-1')
+        cache.set_many(['Good  news', 'Bad news'], [0.8, 0.2])
+        # Whitespace variants share an entry
+        self.assertEqual(cache.get_many(['Good news', 'Bad news', 'Other news']), [0.8, 0.2, None])
+        self.assertEqual((cache.memory_hits, cache.db_hits, cache.misses), (2, 0, 1))
+
+        cache.clear_memory()
+        self.assertEqual(cache.get_many(['Good news', 'Good news']), [0.8, 0.8])
+        self.assertEqual(cache.db_hits, 2)
+        self.assertEqual(cache.get('Good news'), 0.8)
+        self.assertEqual(cache.memory_hits, 3)
+        self.assertAlmostEqual(cache.stats()['hit_rate'], 5 / 6)
+
+    def test_memory_tier_is_bounded(self):
+        cache = NLPCache('sentiment', 'lexicon-1', maxsize=2)
+        cache.set_many(['a', 'b', 'c'], [0.1, 0.2, 0.3])
+        self.assertEqual(cache.stats()['memory_size'], 2)
+        self.assertEqual(cache.get('a'), 0.1)  # Evicted from memory, still in the table
+        self.assertEqual(cache.db_hits, 1)
+
+    def test_new_version_stops_matching_old_rows(self):
+        NLPCache('keywords', 'spacy-3.7').set('Solar panels sell out', ['solar panels'])
+        upgraded = NLPCache('keywords', lambda: 'spacy-3.8')
+        self.assertIsNone(upgraded.get('Solar panels sell out'))
+        upgraded.set('Solar panels sell out', ['solar', 'panels'])
+        self.assertIsNone(NLPCache('sentiment', 'spacy-3.8').get('Solar panels sell out'))
+
+        self.assertEqual(upgraded.purge_stale(), 1)
+        self.assertEqual(list(NLPCacheEntry.objects.values_list('version', flat=True)), ['spacy-3.8'])
+
+    def test_cached_batch_computes_each_distinct_miss_once(self):
+        cache = NLPCache('sentiment', 'test')
+        cache.set('Known', 0.9)
+        computed = []
+
+        def compute(missing):
+            computed.append(list(missing))
+            return [len(text) / 10 for text in missing]
+
+        texts = ['Known', 'Fresh one', 'Fresh  one', 'Another']
+        self.assertEqual(_cached_batch(cache, texts, compute), [0.9, 0.9, 0.9, 0.7])
+        self.assertEqual(computed, [['Fresh one', 'Another']])
+        self.assertEqual(_cached_batch(cache, texts, compute), [0.9, 0.9, 0.9, 0.7])
+        self.assertEqual(len(computed), 1)
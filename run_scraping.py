@@ -16,4 +16,8 @@ result = run_multi_source_scraping.delay()
 print(f"✅ Task started!")
 print(f"📋 Task ID: {result.id}")
 print("🔍 Check Celery worker terminal for progress...")
-print("💡 Make sure Celery is running: celery -A trendy_project worker --pool=solo")
\ No newline at end of file
+# Tasks are routed to the scraping and analysis queues (CELERY_TASK_ROUTES);
+# a worker only consumes the queues it is started with
+print("💡 Make sure a Celery worker consumes both queues:")
+print("   celery -A trendy_project worker --pool=solo -Q scraping,analysis")
+print("   (or one worker per stage, see the TRENDY_WORKER_STAGE notes in settings.py)")
\ No newline at end of file
@@ -1,8 +1,54 @@
+import gc
 import os
 from celery import Celery
+from celery.signals import worker_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'trendy_project.settings')
 
 app = Celery('trendy_project')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
+
+
+# Worker stage ('scrape' or 'analysis'), chosen per worker process. The pool
+# and concurrency must be in the config before the worker parses its options.
+STAGE = os.environ.get('TRENDY_WORKER_STAGE')
+
+
+def configure_stage(conf, stage):
+    """Apply a stage's pool and concurrency settings (--pool / --concurrency still win)"""
+    from django.conf import settings
+    if stage == 'scrape':
+        conf.worker_pool = settings.SCRAPE_WORKER_POOL
+        conf.worker_concurrency = settings.SCRAPE_WORKER_CONCURRENCY
+    elif stage == 'analysis':
+        conf.worker_pool = settings.ANALYSIS_WORKER_POOL
+        conf.worker_concurrency = settings.ANALYSIS_WORKER_CONCURRENCY
+    elif stage:
+        raise ValueError(f"Unknown TRENDY_WORKER_STAGE: {stage!r}")
+
+
+configure_stage(app.conf, STAGE)
+
+
+@worker_init.connect
+def preload_nlp_models(sender=None, **kwargs):
+    """
+    Load spaCy in the worker's parent process, before the pool forks, so
+    prefork children share the model's pages copy-on-write instead of each
+    loading their own copy. Scrape-only workers skip it, as does any worker
+    with TRENDY_PRELOAD_NLP=0.
+    """
+    if os.environ.get('TRENDY_PRELOAD_NLP', '1') != '1':
+        return
+    if STAGE == 'scrape':
+        return
+    from core.services.ml_services import warm_up
+    try:
+        warm_up()
+    except Exception as e:
+        print(f"⚠️ NLP preload failed, models will load on first use: {e}")
+        return
+    # Move the loaded objects out of the collector's reach: GC passes in the
+    # children would otherwise touch (and so copy) every shared page
+    gc.freeze()
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from celery.schedules import crontab
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -78,9 +80,29 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock at BEGIN: a deferred transaction upgrading
+            # from read to write fails at once instead of waiting busy_timeout
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Applied to every SQLite connection (core/db.py), so several workers and the
+# dashboard can share db.sqlite3
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',  # Readers and the writer don't block each other
+    'busy_timeout': 5000,  # ms to wait for the write lock before "database is locked"
+    'synchronous': 'NORMAL',  # Durable with WAL except on power loss; no sync per commit
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# Run each process's write transactions on one writer thread that coalesces
+# them (core.db.write), instead of every thread contending for the lock.
+# Off by default: with WAL and synchronous=NORMAL commits are cheap, and
+# benchmarks/stress_sqlite.py measured the batcher slower (293 vs 330 rows/s)
+WRITE_BATCHING = False
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -124,5 +146,85 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# On-disk cache for scraper GET responses (core/scrapers/response_cache.py)
+SCRAPER_CACHE_DIR = BASE_DIR / 'cache' / 'http'
+SCRAPER_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+
+# spaCy batching for keyword extraction (core/services/ml_services.py).
+# n_process > 1 forks its own workers, which Celery's prefork children
+# (daemonic processes) are not allowed to do; use it with --pool=solo/threads.
+NLP_BATCH_SIZE = 64
+NLP_N_PROCESS = 1
+
+# 'lexicon' scores sentiment in batches with core/services/sentiment_engine.py
+# (TextBlob's lexicon and rules, vectorized); 'textblob' builds a TextBlob per text
+SENTIMENT_BACKEND = 'lexicon'
+
+# 'spacy' returns noun chunks; 'tfidf' returns the highest TF-IDF n-grams
+# against running per-niche document frequencies (core/services/tfidf_keywords.py)
+KEYWORD_EXTRACTOR = 'spacy'
+
+# Days of headline fingerprints kept to collapse syndicated near-duplicates
+DEDUPE_WINDOW_DAYS = 3
+
+# Trends not joined by a new item for this long are closed to clustering
+TREND_WINDOW_HOURS = 48
+
+
+# The pipeline runs in two stages on their own queues, so each worker can be
+# sized for its bottleneck (TRENDY_WORKER_STAGE applies the pool and
+# concurrency below, see trendy_project/celery.py):
+#   TRENDY_WORKER_STAGE=scrape celery -A trendy_project worker -Q scraping    # I/O bound: threads
+#   TRENDY_WORKER_STAGE=analysis celery -A trendy_project worker -Q analysis  # CPU bound: processes
+# A single development worker has to consume both queues:
+#   celery -A trendy_project worker --pool=solo -Q scraping,analysis
+SCRAPE_QUEUE = 'scraping'
+ANALYSIS_QUEUE = 'analysis'
+SCRAPE_WORKER_POOL = 'threads'
+SCRAPE_WORKER_CONCURRENCY = 16
+ANALYSIS_WORKER_POOL = 'prefork'
+ANALYSIS_WORKER_CONCURRENCY = None  # One process per CPU
+
+# ScrapedData ids per analysis task
+ANALYSIS_BATCH_SIZE = 200
+
+# ScrapedData rows per INSERT / UPDATE statement when storing a niche's items
+INGEST_BATCH_SIZE = 500
+
+# Analyse in the scrape task instead of queueing it (single-worker setups)
+ANALYSIS_INLINE = False
+
+
+# Days scraped items are kept before core.tasks.apply_retention archives and
+# deletes them, by source name ('default' for the others, None for forever).
+# DataSource.config['retention_days'] overrides this for one source.
+RETENTION_DAYS = {
+    'default': 90,
+    'news': 30,
+    'news_direct': 30,
+    'twitter': 30,
+    'google_trends': 30,
+}
+# Gzipped JSONL partitions: ARCHIVE_DIR/<source>/<YYYY-MM-DD>.jsonl.gz
+ARCHIVE_DIR = BASE_DIR / 'archive'
+# Age after which a derivable cleaned_data is dropped
+COMPACT_AFTER_DAYS = 7
+# Days persisted NLP results are kept (entries of old model versions go at once)
+NLP_CACHE_DAYS = 30
+
+
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+CELERY_TASK_ROUTES = {
+    'core.tasks.run_multi_source_scraping': {'queue': SCRAPE_QUEUE},
+    'core.tasks.run_scraping_and_analysis': {'queue': SCRAPE_QUEUE},
+    'core.tasks.analyze_scraped_data': {'queue': ANALYSIS_QUEUE},
+    'core.tasks.apply_retention': {'queue': SCRAPE_QUEUE},
+}
+CELERY_BEAT_SCHEDULE = {
+    'apply-retention': {
+        'task': 'core.tasks.apply_retention',
+        'schedule': crontab(hour=3, minute=30),
+    },
+}